@@ -0,0 +1,51 @@
+"""
+Measure recall and latency of :class:`pretoText.scidata.neighbours.CosineIndex`
+against an exact search, on random clustered vectors.
+
+Usage::
+
+    python benchmarks/bench_cosine_index.py [n_vectors] [dimensions]
+"""
+
+from pretoText.scidata.neighbours import CosineIndex
+from pretoText.scidata.vectors import normalize_rows
+import numpy as np
+import sys
+import time
+
+
+def make_vectors(n_vectors, dimensions, seed=0):
+    rng = np.random.RandomState(seed)
+    centers = rng.randn(max(n_vectors // 1000, 10), dimensions)
+    vectors = centers[rng.randint(len(centers), size=n_vectors)]
+    return (vectors + rng.randn(n_vectors, dimensions)).astype(np.float32)
+
+
+if __name__ == "__main__":
+    n_vectors = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    dimensions = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    k = 10
+
+    vectors = make_vectors(n_vectors, dimensions)
+    queries = make_vectors(100, dimensions, seed=1)
+
+    start = time.perf_counter()
+    index = CosineIndex(n_lists=int(np.sqrt(n_vectors))).build(vectors)
+    print("build: %.1f s" % (time.perf_counter() - start))
+
+    normalized = normalize_rows(vectors)
+    exact = [
+        set(np.argpartition(-normalized.dot(q / np.linalg.norm(q)), k)[:k])
+        for q in queries
+    ]
+
+    for n_probe in (1, 4, 8, 16, 32):
+        start = time.perf_counter()
+        found = [index.query(q, k=k, n_probe=n_probe)[0] for q in queries]
+        latency = (time.perf_counter() - start) / len(queries)
+
+        recall = np.mean([len(e.intersection(f)) / k for e, f in zip(exact, found)])
+        print(
+            "n_probe=%2d  recall@%d=%.3f  latency=%.3f ms"
+            % (n_probe, k, recall, latency * 1000)
+        )
@@ -0,0 +1,91 @@
+"""
+Compare the memory held by a :class:`pretoText.scidata.Patent.PatentCollection`
+with the one of the equivalent :class:`pandas.DataFrame`, both built from the same
+:func:`pretoText.scidata.Patent.read_patents` stream of the same dump.
+
+Each container is built in its own process. Once built and garbage collected, the increase
+of the resident memory still held by the process is reported (Linux only), together with
+the bytes the container accounts for itself: ``DataFrame.memory_usage(deep=True)``,
+which does not count the codes inside ``cpc`` lists, and ``PatentCollection.nbytes``.
+Collections are measured with plain and with compressed text buffers.
+
+Usage::
+
+    python benchmarks/bench_patent_collection.py [n_patents]
+"""
+
+from corpus import make_dump
+from multiprocessing import get_context
+import gc
+import os
+import sys
+import tempfile
+
+
+def _rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _held_memory(loader, path, fields, queue):
+    import numpy
+    import pandas
+
+    from pretoText.scidata.Patent import PatentCollection, read_patents
+
+    def load(patents):
+        if loader == "dataframe":
+            container = pandas.DataFrame.from_records(
+                (patent.to_dict() for patent in patents), columns=fields
+            )
+            return container, container.memory_usage(deep=True).sum()
+
+        container = PatentCollection.from_patents(
+            patents, fields=fields, compress=loader == "compressed"
+        )
+        return container, container.nbytes
+
+    # a first small load, so that modules loaded lazily are not measured
+    load(next(read_patents(path, chunksize=10, fields=fields)))
+
+    gc.collect()
+    before = _rss()
+
+    container, nbytes = load(read_patents(path, fields=fields))
+
+    gc.collect()
+    queue.put(((_rss() - before) / 2**20, nbytes / 2**20))
+
+
+def measure(loader, path, fields):
+    context = get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_held_memory, args=(loader, path, fields, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+if __name__ == "__main__":
+    n_patents = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "patents.jsonl")
+        make_dump(path, n_patents)
+
+        for fields in [
+            ["id", "title", "abstract", "claims", "description", "cpc", "date"],
+            ["id", "title", "cpc", "date"],
+        ]:
+            df_rss, df_bytes = measure("dataframe", path, fields)
+            print(
+                "%s\n    DataFrame:                   held RSS %7.1f MB, own bytes %7.1f MB"
+                % (", ".join(fields), df_rss, df_bytes)
+            )
+            for loader in ["collection", "compressed"]:
+                rss, nbytes = measure(loader, path, fields)
+                print(
+                    "    PatentCollection %-10s  held RSS %7.1f MB (%.1fx), own bytes %7.1f MB (%.1fx)"
+                    % (loader, rss, df_rss / rss, nbytes, df_bytes / nbytes)
+                )
@@ -0,0 +1,74 @@
+"""
+Compare the WordNet ranking of :mod:`pretoText.textanalysis.similarities.wordnet`,
+which looks up each distinct word once and scores all pairs with a sparse product,
+with the loop of ``_iteration_task``, which looks up the words of every other element
+for each element, over the same terms.
+
+If the WordNet corpus is not installed, a seeded stand-in lexicon is used instead,
+with a few synsets per word, so that lookups are cheaper than the real ones.
+
+Usage::
+
+    python benchmarks/bench_wordnet.py [n_terms]
+"""
+
+from corpus import make_records
+from functools import partial
+import numpy as np
+import sys
+import time
+import types
+
+
+def stand_in_wordnet(words, n_synsets=2000, seed=0):
+    rng = np.random.RandomState(seed)
+    lexicon = {
+        word: ["s%d.n.01" % s for s in rng.randint(n_synsets, size=rng.randint(4))]
+        for word in words
+    }
+
+    class Synset(str):
+        def name(self):
+            return str(self)
+
+    return types.SimpleNamespace(
+        synsets=lambda word: [Synset(name) for name in lexicon.get(word, [])]
+    )
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    from pretoText.textanalysis.similarities import wordnet
+
+    n_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    # terms of two or three words, from the titles of the synthetic corpus
+    terms = []
+    for record in make_records(n_terms, lengths={"title": 3}):
+        terms.append(" ".join(record["title"].lower().split()[: 2 + len(terms) % 2]))
+    terms = list(dict.fromkeys(terms))
+
+    try:
+        wordnet.wn.ensure_loaded()
+    except LookupError:
+        print("WordNet is not installed: using a stand-in lexicon")
+        wordnet.wn = stand_in_wordnet({w for term in terms for w in term.split(" ")})
+
+    start = time.perf_counter()
+    rows = list(map(partial(wordnet._iteration_task, items=terms), terms))
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranking = wordnet.ranking_by_wordnet_from_df(pd.DataFrame({"terms": terms}))
+    product = time.perf_counter() - start
+
+    scores = pd.concat(rows, sort=True)
+    assert all(scores.loc[a, b] == w for a, b, w in ranking.itertuples(index=False))
+
+    print(
+        "%d terms, %d ranked pairs\n"
+        "    _iteration_task loop: %8.3f s\n"
+        "    incidence product:    %8.3f s, speedup: %.0fx"
+        % (len(terms), len(ranking), loop, product, loop / product)
+    )
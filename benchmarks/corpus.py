@@ -0,0 +1,68 @@
+"""
+Seeded generators of synthetic, patent-like corpora shared by the benchmarks.
+"""
+
+import json
+import random
+import string
+
+
+def make_vocabulary(size=20000, seed=0):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12)))
+        for _ in range(size)
+    ]
+
+
+def make_cpc_codes(size=3000, seed=0):
+    rng = random.Random(seed)
+    return [
+        "%s%02d%s%d/%02d"
+        % (
+            rng.choice("ABCDEFGH"),
+            rng.randint(1, 99),
+            rng.choice("ABCDEFGH"),
+            rng.randint(1, 999),
+            rng.randint(0, 99),
+        )
+        for _ in range(size)
+    ]
+
+
+def make_records(n_patents, lengths=None, seed=0):
+    """
+    Yield ``n_patents`` patent dictionaries whose words follow a Zipf-like distribution,
+    as in natural language.
+    """
+    rng = random.Random(seed)
+    words = make_vocabulary(seed=seed)
+    codes = make_cpc_codes(seed=seed)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    lengths = lengths or {
+        "title": 10,
+        "abstract": 150,
+        "claims": 300,
+        "description": 600,
+    }
+
+    for i in range(n_patents):
+        record = {"id": "US%08d" % i}
+        for field, length in lengths.items():
+            record[field] = " ".join(rng.choices(words, weights, k=length))
+        record["cpc"] = rng.sample(codes, rng.randint(1, 6))
+        record["date"] = "20%02d-%02d-%02d" % (
+            rng.randint(0, 19),
+            rng.randint(1, 12),
+            rng.randint(1, 28),
+        )
+        yield record
+
+
+def make_dump(path, n_patents, lengths=None, seed=0):
+    """
+    Write a *JSONL* dump of ``n_patents`` synthetic patents.
+    """
+    with open(path, "w") as f:
+        for record in make_records(n_patents, lengths=lengths, seed=seed):
+            f.write(json.dumps(record) + "\n")
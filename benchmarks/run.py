@@ -0,0 +1,283 @@
+"""
+Benchmark suite of the hot paths of pretoText, over seeded synthetic patent corpora.
+
+Each benchmark is timed (best of ``--repeat`` runs) and its peak memory is traced
+(Python and numpy allocations of the main process, as seen by ``tracemalloc``), then results are compared against a stored baseline: any benchmark slower or hungrier
+than the baseline by more than the given tolerance is flagged as a regression,
+and the suite exits with status 1.
+
+Usage::
+
+    # record the baseline, e.g. on the main branch
+    python benchmarks/run.py --sizes 1000 10000 100000 --save-baseline
+
+    # compare a change against it
+    python benchmarks/run.py --sizes 1000 10000 100000
+
+    # only the benchmarks whose name contains "vectorizer"
+    python benchmarks/run.py --select vectorizer
+"""
+
+from corpus import make_dump, make_records
+import argparse
+import json
+import numpy as np
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# the short abstracts of benchmarks, to keep the largest corpora in memory
+LENGTHS = {"title": 10, "abstract": 100}
+
+BENCHMARKS = []
+
+
+def benchmark(function):
+    BENCHMARKS.append(function)
+    return function
+
+
+class Corpus:
+    """
+    The data shared by all the benchmarks of a given size, built once.
+    """
+
+    def __init__(self, n_patents, folder):
+        from pretoText.scidata.Patent import Patent, PatentVectorizer
+
+        self.n_patents = n_patents
+        self.folder = folder
+        self.dump = os.path.join(folder, "patents.jsonl")
+        make_dump(self.dump, n_patents, lengths=LENGTHS)
+
+        self.patents = [Patent(**r) for r in make_records(n_patents, lengths=LENGTHS)]
+        self.texts = [patent.abstract for patent in self.patents]
+
+        self.vectorizer = PatentVectorizer(min_df=2, chunksize=5000).fit(self.texts)
+        self.X = self.vectorizer.transform(self.texts)
+        # words to look for, as in a labelling of sentences
+        self.targets = sorted(self.vectorizer.vocabulary_)[:50]
+
+        rng = np.random.RandomState(0)
+        # terms are far fewer than documents, as in a similarity ranking
+        self.n_terms = min(n_patents, 20000)
+        self.vectors = rng.randn(self.n_terms, 300).astype(np.float32)
+        self.labels = ["t%d" % i for i in range(self.n_terms)]
+
+
+@benchmark
+def read_patents_jsonl(corpus):
+    from pretoText.scidata.Patent import read_patents
+
+    for _ in read_patents(corpus.dump, fields=["id", "abstract", "cpc"]):
+        pass
+
+
+@benchmark
+def patent_collection_from_patents(corpus):
+    from pretoText.scidata.Patent import PatentCollection
+
+    PatentCollection.from_patents(corpus.patents)
+
+
+@benchmark
+def patent_vectorizer_fit(corpus):
+    from pretoText.scidata.Patent import PatentVectorizer
+
+    PatentVectorizer(min_df=2, chunksize=5000).fit(corpus.texts)
+
+
+@benchmark
+def patent_vectorizer_transform(corpus):
+    corpus.vectorizer.transform(corpus.texts)
+
+
+@benchmark
+def patent_vectorizer_hashing_parallel(corpus):
+    from pretoText.scidata.Patent import PatentVectorizer
+
+    PatentVectorizer(hashing=True, chunksize=5000).transform_parallel(corpus.texts)
+
+
+@benchmark
+def csr_store_save_and_slice(corpus):
+    from pretoText.scidata.matrices import CSRStore, save_csr
+
+    folder = os.path.join(corpus.folder, "dtm")
+    save_csr(folder, corpus.X, vocabulary=corpus.vectorizer.vocabulary_)
+
+    store = CSRStore(folder)
+    for block in store.iter_blocks(1000):
+        pass
+
+
+@benchmark
+def top_k_cosine_edges(corpus):
+    from pretoText.scidata.neighbours import top_k_cosine_edges
+
+    top_k_cosine_edges(corpus.vectors, labels=corpus.labels, k=10)
+
+
+@benchmark
+def cosine_index_build_and_query(corpus):
+    from pretoText.scidata.neighbours import CosineIndex
+
+    index = CosineIndex(n_lists=int(np.sqrt(corpus.n_terms))).build(corpus.vectors)
+    for vector in corpus.vectors[:100]:
+        index.query(vector, k=10)
+
+
+@benchmark
+def cosine_similarity_many_to_many(corpus):
+    from pretoText.scidata.vectors import cosine_similarity
+
+    cosine_similarity(corpus.vectors[:500], corpus.vectors, dtype=np.float32)
+
+
+@benchmark
+def pairwise_cosine_similarity(corpus):
+    from pretoText.scidata.vectors import pairwise_cosine_similarity
+
+    pairs = np.random.RandomState(0).randint(corpus.n_terms, size=(100000, 2))
+    pairwise_cosine_similarity(corpus.vectors, pairs, dtype=np.float32)
+
+
+@benchmark
+def convert_matrix_to_adjacency_df(corpus):
+    from pretoText.scidata.graphs import convert_matrix_to_adjacency_df
+
+    n_terms = min(corpus.n_terms, 2000)
+    vectors = corpus.vectors[:n_terms]
+    convert_matrix_to_adjacency_df(
+        vectors.dot(vectors.T), labels=corpus.labels[:n_terms]
+    )
+
+
+@benchmark
+def target_values_vec_from_texts(corpus):
+    from pretoText.scidata.dataframes import target_values_vec
+
+    target_values_vec(corpus.texts, corpus.targets)
+
+
+@benchmark
+def target_values_vec_from_matrix(corpus):
+    from pretoText.scidata.dataframes import target_values_vec
+
+    target_values_vec(
+        None, corpus.targets, matrix=corpus.X, vocabulary=corpus.vectorizer.vocabulary_
+    )
+
+
+@benchmark
+def sparse_matrix_from_text(corpus):
+    from pretoText.scidata.dataframes import sparse_matrix_from_text
+
+    sparse_matrix_from_text(corpus.texts, chunksize=5000)
+
+
+@benchmark
+def sparse_matrix_from_text_hashing_parallel(corpus):
+    from pretoText.scidata.dataframes import sparse_matrix_from_text
+
+    sparse_matrix_from_text(corpus.texts, hashing=True, n_jobs=-1, chunksize=5000)
+
+
+@benchmark
+def save_dtm_parquet(corpus):
+    from pretoText.utils.exporters import save_dtm_parquet
+
+    save_dtm_parquet(corpus.X, os.path.join(corpus.folder, "dtm.parquet"))
+
+
+def measure(function, corpus, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(corpus)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function(corpus)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"time": min(times), "memory": peak}
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    regressions = []
+    for key, result in sorted(results.items()):
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if result["time"] > reference["time"] * time_tolerance:
+            regressions.append(
+                "%s: time %.3f s vs %.3f s" % (key, result["time"], reference["time"])
+            )
+        if result["memory"] > reference["memory"] * memory_tolerance:
+            regressions.append(
+                "%s: memory %.1f MB vs %.1f MB"
+                % (key, result["memory"] / 2**20, reference["memory"] / 2**20)
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--select", default="")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--time-tolerance", type=float, default=1.5)
+    parser.add_argument("--memory-tolerance", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            corpus = Corpus(size, folder)
+            for function in BENCHMARKS:
+                if args.select not in function.__name__:
+                    continue
+                key = "%s[%d]" % (function.__name__, size)
+                results[key] = measure(function, corpus, args.repeat)
+                print(
+                    "%-48s %9.3f s %9.1f MB"
+                    % (key, results[key]["time"], results[key]["memory"] / 2**20)
+                )
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print("Baseline saved to %s" % args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare with: run with --save-baseline first")
+        return 0
+
+    with open(args.baseline) as f:
+        regressions = compare(
+            results, json.load(f), args.time_tolerance, args.memory_tolerance
+        )
+
+    for regression in regressions:
+        print("REGRESSION %s" % regression)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
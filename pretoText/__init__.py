@@ -2,9 +2,9 @@
 # import sentry_sdk
 # sentry_sdk.init("https://fd5b6fe456a64e8f91d7c424f3a35003@sentry.io/1442181")
 
-import lazy_import
+from ._lazy import lazy_submodules
 
-lazy_import.lazy_module("pretoText.Patent")
+__getattr__, __dir__ = lazy_submodules(__name__, ["scidata", "textanalysis", "utils"])
 
 # version
 from ._version import get_versions
@@ -0,0 +1,34 @@
+import importlib
+
+
+def lazy_submodules(package, submodules):
+    """
+    Make the submodules of a package importable on first access only,
+    so that importing the package itself costs nothing.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        __getattr__, __dir__ = lazy_submodules(__name__, ["graphs", "matrices"])
+
+    Args:
+        package (str):
+            The name of the package.
+        submodules (list):
+            The names of the submodules.
+
+    Returns:
+        tuple:
+            The ``__getattr__`` and ``__dir__`` functions for the package module.
+    """
+    submodules = set(submodules)
+
+    def __getattr__(name):
+        if name in submodules:
+            return importlib.import_module("%s.%s" % (package, name))
+        raise AttributeError("module %r has no attribute %r" % (package, name))
+
+    def __dir__():
+        return sorted(set(vars(importlib.import_module(package))) | submodules)
+
+    return __getattr__, __dir__
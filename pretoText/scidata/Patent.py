@@ -1,14 +1,985 @@
-from sklearn.feature_extraction.text import CountVectorizer
+from array import array
+from collections import Counter
+from xml.etree import ElementTree
+import csv
+import gzip
+import io
+import json
 import numpy as np
-import pandas as pd
-import sklearn
+import os
+import zlib
+
+
+# scikit-learn, scipy, pandas and joblib are imported where needed,
+# since reading patents does not require any of them
 
 
 __all__ = [
-    "dummy"
+    "FIELDS",
+    "TEXT_FIELDS",
+    "Patent",
+    "PatentReader",
+    "PatentCollection",
+    "PatentVectorizer",
+    "read_patents",
 ]
 
 
-def dummy():
-    print('stokazomai')
+FIELDS = ("id", "title", "abstract", "claims", "description", "cpc", "date")
+
+TEXT_FIELDS = ("id", "title", "abstract", "claims", "description")
+
+JSONL = "jsonl"
+CSV = "csv"
+XML = "xml"
+
+# full descriptions easily exceed the default limit of 128 KB per CSV field
+CSV_FIELD_LIMIT = 2**31 - 1
+
+
+class Patent:
+    """
+    A single patent record.
+    Fields which were not read from the source are left to ``None``.
+
+    Args:
+        id (str, optional):
+            The patent identifier (e.g. the publication number).
+        title (str, optional):
+            The title of the patent.
+        abstract (str, optional):
+            The abstract of the patent.
+        claims (str, optional):
+            The claims of the patent, as a single text.
+        description (str, optional):
+            The full description of the patent.
+        cpc (list, optional):
+            The *CPC* codes assigned to the patent.
+        date (str, optional):
+            The publication date of the patent, as ``YYYY-MM-DD``.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(
+        self,
+        id=None,
+        title=None,
+        abstract=None,
+        claims=None,
+        description=None,
+        cpc=None,
+        date=None,
+    ):
+        self.id = id
+        self.title = title
+        self.abstract = abstract
+        self.claims = claims
+        self.description = description
+        self.cpc = cpc
+        self.date = date
+
+    def to_dict(self):
+        """
+        Turn the patent into a dictionary.
+
+        Returns:
+            dict:
+                Field names key-valued to their values.
+        """
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, Patent):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return "Patent(id=%r, title=%r)" % (self.id, self.title)
+
+
+class PatentReader:
+    """
+    Stream patents one at a time from a *JSONL*, *CSV* or *XML* dump, optionally gzipped.
+    Only one record at a time is kept in memory, so dumps of any size are read in constant memory.
+
+    Each reader keeps track of its position in the dump: :meth:`tell` returns an offset
+    which can be given to a new reader in order to resume reading right after the last patent yielded.
+    For *JSONL* and *CSV* dumps the offset is a byte position of the uncompressed stream:
+    resuming a plain dump is immediate, while a gzipped one is decompressed again up to the offset.
+    For *XML* dumps it is the number of records already read, which must be skipped again.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        reader = PatentReader("patents.jsonl.gz", fields=["id", "abstract"])
+
+        for chunk in reader.chunks(10000):
+            process(chunk)
+            checkpoint(reader.tell())
+
+        # later on
+        reader = PatentReader("patents.jsonl.gz", fields=["id", "abstract"], offset=last_checkpoint)
+
+    Args:
+        path (str):
+            The path of the dump.
+        fmt (str, optional):
+            One of ``jsonl``, ``csv`` or ``xml``.
+            Defaults to None (inferred from the extension of ``path``).
+        fields (list, optional):
+            The fields to keep; any other field is not stored. *JSON* lines and *CSV* rows
+            are still parsed whole, and only *XML* elements of other fields are skipped.
+            Defaults to None (all fields).
+        offset (int, optional):
+            The offset, as returned by :meth:`tell`, to start reading from.
+            Defaults to 0.
+        field_map (dict, optional):
+            Patent fields key-valued to the names they have in the dump.
+            Defaults to None (names are the same).
+        record_tag (str, optional):
+            The *XML* tag enclosing a single patent.
+            Defaults to ``patent``.
+        cpc_separator (str, optional):
+            The separator of *CPC* codes when they are stored as a single text.
+            Defaults to ``;``.
+        encoding (str, optional):
+            The encoding of the dump.
+            Defaults to ``utf-8``.
+    """
+
+    def __init__(
+        self,
+        path,
+        fmt=None,
+        fields=None,
+        offset=0,
+        field_map=None,
+        record_tag="patent",
+        cpc_separator=";",
+        encoding="utf-8",
+    ):
+        self.path = path
+        self.fmt = fmt if fmt is not None else _infer_format(path)
+        self.fields = tuple(FIELDS if fields is None else fields)
+        self.offset = offset
+        self.field_map = {field: field for field in FIELDS}
+        self.field_map.update(field_map or {})
+        self.record_tag = record_tag
+        self.cpc_separator = cpc_separator
+        self.encoding = encoding
+
+        if self.fmt not in (JSONL, CSV, XML):
+            raise ValueError("Unsupported format: %s" % self.fmt)
+
+        unknown = set(self.fields).difference(FIELDS)
+        if unknown:
+            raise ValueError("Unknown patent fields: %s" % ", ".join(sorted(unknown)))
+
+    def __iter__(self):
+        if self.fmt == JSONL:
+            return self._iter_jsonl()
+        if self.fmt == CSV:
+            return self._iter_csv()
+        return self._iter_xml()
+
+    def tell(self):
+        """
+        Get the offset right after the last patent yielded.
+
+        Returns:
+            int:
+                The offset which a new :class:`PatentReader` can resume from.
+        """
+        return self.offset
+
+    def chunks(self, size):
+        """
+        Stream patents in lists of ``size`` elements; the last one may be shorter.
+
+        Args:
+            size (int):
+                The number of patents in each chunk.
+
+        Returns:
+            generator:
+                Lists of :class:`Patent`.
+        """
+        return _chunked(self, size)
+
+    def _make_patent(self, record):
+        values = {}
+        for field in self.fields:
+            value = record.get(self.field_map[field])
+            if field == "cpc":
+                value = self._split_cpc(value)
+            values[field] = value
+        return Patent(**values)
+
+    def _split_cpc(self, value):
+        if value is None or isinstance(value, list):
+            return value
+        return [
+            code.strip() for code in value.split(self.cpc_separator) if code.strip()
+        ]
+
+    def _iter_jsonl(self):
+        with _open_binary(self.path) as f:
+            f.seek(self.offset)
+            for line in iter(f.readline, b""):
+                self.offset = f.tell()
+                if not line.strip():
+                    continue
+                yield self._make_patent(json.loads(line.decode(self.encoding)))
+
+    def _iter_csv(self):
+        csv.field_size_limit(CSV_FIELD_LIMIT)
+
+        with _open_binary(self.path) as f:
+            header = next(csv.reader([_read_csv_record(f).decode(self.encoding)]))
+            columns = {
+                header.index(self.field_map[field]): self.field_map[field]
+                for field in self.fields
+                if self.field_map[field] in header
+            }
+
+            if self.offset > f.tell():
+                f.seek(self.offset)
+
+            for record in iter(lambda: _read_csv_record(f), b""):
+                self.offset = f.tell()
+                if not record.strip():
+                    continue
+                row = next(csv.reader(io.StringIO(record.decode(self.encoding))))
+                yield self._make_patent(
+                    {name: row[i] for i, name in columns.items() if i < len(row)}
+                )
+
+    def _iter_xml(self):
+        read = 0
+        sources = {self.field_map[field] for field in self.fields}
+
+        with _open_binary(self.path) as f:
+            opened = []
+
+            for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    opened.append(elem)
+                    continue
+
+                opened.pop()
+                if elem.tag != self.record_tag:
+                    continue
+
+                if read >= self.offset:
+                    record = {}
+                    if "cpc" in self.fields:
+                        record[self.field_map["cpc"]] = []
+                    for child in elem:
+                        if child.tag not in sources:
+                            continue
+                        if child.tag == self.field_map["cpc"]:
+                            record[child.tag].append((child.text or "").strip())
+                        else:
+                            record[child.tag] = "".join(child.itertext()).strip()
+                    self.offset = read + 1
+                    yield self._make_patent(record)
+
+                read += 1
+                # free the already parsed record
+                if opened:
+                    opened[-1].remove(elem)
+
+
+def read_patents(path, chunksize=None, **reader_kwargs):
+    """
+    Stream patents from a *JSONL*, *CSV* or *XML* dump, optionally gzipped, in constant memory.
+    Any further argument is given to :class:`PatentReader`.
+
+    Args:
+        path (str):
+            The path of the dump.
+        chunksize (int, optional):
+            If specified, patents are yielded in lists of ``chunksize`` elements.
+            Defaults to None.
+
+    Returns:
+        generator:
+            :class:`Patent` one at a time, or lists of them if ``chunksize`` is specified.
+    """
+    reader = PatentReader(path, **reader_kwargs)
+
+    if chunksize is not None:
+        return reader.chunks(chunksize)
+
+    return iter(reader)
+
+
+class PatentCollection:
+    """
+    A compact, columnar collection of patents.
+
+    Each text field is stored as a single contiguous *UTF-8* buffer plus an ``int64`` array of offsets,
+    *CPC* codes are interned to integer ids and dates are stored as ``numpy.datetime64``.
+    Hence, no Python object is kept per patent: random access is O(1) and slicing
+    returns a view sharing the same buffers, without copying any data.
+    Missing text values are read back as empty strings.
+
+    Text buffers can also be compressed by :meth:`from_patents`, by blocks of ``block_size``
+    uncompressed bytes with *zlib*. Offsets stay uncompressed positions, so the blocks of a text
+    are found by arithmetic and reading it decompresses only the blocks it spans; the last decompressed
+    block is kept, so that reading patents in order decompresses each block once.
+    Random access is then slower, by the decompression of a block for each text field.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        patents = PatentCollection.from_patents(
+            read_patents("patents.jsonl", fields=["id", "abstract", "cpc", "date"])
+        )
+
+        patents[42]  # a Patent
+        patents[1000:2000]  # a PatentCollection view
+        patents.column("abstract")  # a generator of texts
+
+    Args:
+        texts (dict):
+            Text fields key-valued to pairs of ``uint8`` buffer (or compressed buffer)
+            and ``int64`` offsets.
+        cpc_codes (list, optional):
+            The interned *CPC* codes, where the code of id ``i`` is at position ``i``.
+            Defaults to None.
+        cpc_ids (numpy.ndarray, optional):
+            The *CPC* ids of all patents, one after the other.
+            Defaults to None.
+        cpc_offsets (numpy.ndarray, optional):
+            The offsets of the *CPC* ids of each patent in ``cpc_ids``.
+            Defaults to None.
+        dates (numpy.ndarray, optional):
+            The ``datetime64[D]`` dates of the patents.
+            Defaults to None.
+    """
+
+    def __init__(
+        self, texts, cpc_codes=None, cpc_ids=None, cpc_offsets=None, dates=None
+    ):
+        self.texts = texts
+        self.cpc_codes = cpc_codes
+        self.cpc_ids = cpc_ids
+        self.cpc_offsets = cpc_offsets
+        self.dates = dates
+
+    @classmethod
+    def from_patents(cls, patents, fields=None, compress=False, block_size=2**14):
+        """
+        Build a collection by consuming an iterable of patents, such as a :class:`PatentReader`.
+
+        Args:
+            patents (iterable):
+                The :class:`Patent` to collect.
+            fields (list, optional):
+                The fields to store.
+                Defaults to None (all fields).
+            compress (bool or int, optional):
+                Whether to compress text buffers, or the *zlib* level (1 to 9) to compress them with.
+                Defaults to False.
+            block_size (int, optional):
+                The number of uncompressed bytes of each compressed block.
+                Defaults to 2 ** 14.
+
+        Returns:
+            PatentCollection:
+                The collection of the given patents.
+        """
+        fields = FIELDS if fields is None else fields
+        text_fields = [field for field in TEXT_FIELDS if field in fields]
+
+        level = compress if compress is not True else zlib.Z_DEFAULT_COMPRESSION
+        buffers = {
+            field: _TextBuffer(level if compress else None, block_size)
+            for field in text_fields
+        }
+        offsets = {field: array("q", [0]) for field in text_fields}
+        with_cpc = "cpc" in fields
+        cpc_index = {}
+        cpc_ids = array("i")
+        cpc_offsets = array("q", [0])
+        with_dates = "date" in fields
+        dates = []
+
+        for patent in patents:
+            for field in text_fields:
+                buffers[field].write((getattr(patent, field) or "").encode("utf-8"))
+                offsets[field].append(buffers[field].size)
+
+            if with_cpc:
+                for code in patent.cpc or []:
+                    cpc_ids.append(cpc_index.setdefault(code, len(cpc_index)))
+                cpc_offsets.append(len(cpc_ids))
+
+            if with_dates:
+                dates.append(patent.date or "NaT")
+
+        return cls(
+            {
+                field: (
+                    buffers[field].close(),
+                    np.frombuffer(offsets[field], dtype=np.int64),
+                )
+                for field in text_fields
+            },
+            cpc_codes=list(cpc_index) if with_cpc else None,
+            cpc_ids=np.frombuffer(cpc_ids, dtype=np.int32) if with_cpc else None,
+            cpc_offsets=(
+                np.frombuffer(cpc_offsets, dtype=np.int64) if with_cpc else None
+            ),
+            dates=np.array(dates, dtype="datetime64[D]") if with_dates else None,
+        )
+
+    @property
+    def fields(self):
+        """
+        tuple: The fields stored in the collection.
+        """
+        return tuple(
+            field
+            for field in FIELDS
+            if field in self.texts
+            or (field == "cpc" and self.cpc_ids is not None)
+            or (field == "date" and self.dates is not None)
+        )
+
+    @property
+    def nbytes(self):
+        """
+        int: The number of bytes held by the arrays of the collection.
+        Buffers shared with other views are counted as a whole.
+        """
+        arrays = [a for pair in self.texts.values() for a in pair]
+        arrays += [
+            a for a in (self.cpc_ids, self.cpc_offsets, self.dates) if a is not None
+        ]
+        return sum(a.nbytes for a in arrays)
+
+    def __len__(self):
+        if self.texts:
+            _, offsets = next(iter(self.texts.values()))
+            return len(offsets) - 1
+        if self.cpc_offsets is not None:
+            return len(self.cpc_offsets) - 1
+        if self.dates is not None:
+            return len(self.dates)
+        return 0
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._slice(key)
+
+        size = len(self)
+        if key < 0:
+            key += size
+        if not 0 <= key < size:
+            raise IndexError("PatentCollection index out of range")
+
+        values = {field: self._text(field, key) for field in self.texts}
+        if self.cpc_ids is not None:
+            values["cpc"] = self._cpc(key)
+        if self.dates is not None:
+            values["date"] = _format_date(self.dates[key])
+
+        return Patent(**values)
+
+    def column(self, field):
+        """
+        Stream the values of a single field for all patents.
+
+        Args:
+            field (str):
+                The field to read.
+
+        Returns:
+            generator:
+                The values of the field, in order.
+        """
+        if field in self.texts:
+            return (self._text(field, i) for i in range(len(self)))
+        if field == "cpc" and self.cpc_ids is not None:
+            return (self._cpc(i) for i in range(len(self)))
+        if field == "date" and self.dates is not None:
+            return (_format_date(date) for date in self.dates)
+        raise KeyError("Field not stored in the collection: %s" % field)
+
+    def to_dataframe(self):
+        """
+        Turn the collection into a :class:`pandas.DataFrame`, one row per patent.
+
+        Returns:
+            :class:`pandas.DataFrame`:
+                A column for each stored field.
+        """
+        import pandas as pd
+
+        data = {field: list(self.column(field)) for field in self.fields}
+        if self.dates is not None:
+            data["date"] = self.dates
+        return pd.DataFrame(data, columns=list(self.fields))
+
+    def _text(self, field, i):
+        buffer, offsets = self.texts[field]
+        return bytes(buffer[offsets[i] : offsets[i + 1]]).decode("utf-8")
+
+    def _cpc(self, i):
+        ids = self.cpc_ids[self.cpc_offsets[i] : self.cpc_offsets[i + 1]]
+        return [self.cpc_codes[code_id] for code_id in ids]
+
+    def _slice(self, key):
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            raise ValueError("PatentCollection supports contiguous slices only")
+        stop = max(start, stop)
+
+        # offsets are absolute positions into the shared buffers,
+        # so a view only needs a window over them
+        return PatentCollection(
+            {
+                field: (buffer, offsets[start : stop + 1])
+                for field, (buffer, offsets) in self.texts.items()
+            },
+            cpc_codes=self.cpc_codes,
+            cpc_ids=self.cpc_ids,
+            cpc_offsets=(
+                self.cpc_offsets[start : stop + 1]
+                if self.cpc_offsets is not None
+                else None
+            ),
+            dates=self.dates[start:stop] if self.dates is not None else None,
+        )
+
+
+class PatentVectorizer:
+    """
+    A bag-of-words vectorizer, built on :class:`sklearn.feature_extraction.text.CountVectorizer`,
+    which never needs the whole corpus in memory.
+
+    The vocabulary is fitted in streaming passes over chunks of texts: only document frequencies
+    and total counts of terms are kept, and whenever they exceed ``prune_at`` terms the rarest ones
+    are pruned, down to three quarters of ``prune_at`` so that new terms have room to be counted.
+    Afterwards ``min_df``, ``max_df`` and ``max_features`` are applied as in ``CountVectorizer``.
+    Texts are then transformed chunk by chunk, and each chunk can be written to disk
+    as a CSR block, so that the document-term matrix is never held in memory as a whole.
+
+    With ``hashing`` set, terms are mapped to columns by the hashing trick of
+    :class:`sklearn.feature_extraction.text.HashingVectorizer` instead:
+    there is no vocabulary to fit nor to keep in memory, hence chunks can be transformed
+    independently by parallel workers with :meth:`transform_parallel`.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        vectorizer = PatentVectorizer(field="abstract", min_df=5, max_df=0.5)
+        vectorizer.fit(read_patents("patents.jsonl", fields=["abstract"]))
+
+        store = vectorizer.transform_to_disk(
+            read_patents("patents.jsonl", fields=["abstract"]), "dtm_blocks"
+        )
+
+    Args:
+        field (str, optional):
+            The field to vectorize when :class:`Patent` are given instead of texts.
+            Defaults to ``abstract``.
+        min_df (int or float, optional):
+            Terms appearing in fewer documents (or in a lower proportion of them) are ignored.
+            Defaults to 1.
+        max_df (int or float, optional):
+            Terms appearing in more documents (or in a higher proportion of them) are ignored.
+            Defaults to 1.0.
+        max_features (int, optional):
+            If specified, only the ``max_features`` terms with the highest total count are kept.
+            Defaults to None.
+        prune_at (int, optional):
+            The maximum number of terms tracked while fitting.
+            Since pruned terms are the rarest ones, they would hardly pass ``min_df`` anyway.
+            Defaults to 2000000.
+        chunksize (int, optional):
+            The number of texts processed at once.
+            Defaults to 10000.
+        hashing (bool, optional):
+            Whether to use the hashing trick instead of a vocabulary;
+            ``min_df``, ``max_df``, ``max_features`` and ``prune_at`` are then ignored.
+            Defaults to False.
+        n_features (int, optional):
+            The number of columns when ``hashing`` is set.
+            Defaults to 2 ** 20.
+        alternate_sign (bool, optional):
+            Whether hashed counts get a sign depending on the term, when ``hashing`` is set,
+            so that collisions tend to cancel out.
+            Defaults to True.
+
+    Any further argument (e.g. ``ngram_range=(1, 2)`` for bigrams) is given to the underlying
+    ``CountVectorizer`` or ``HashingVectorizer``.
+    """
+
+    def __init__(
+        self,
+        field="abstract",
+        min_df=1,
+        max_df=1.0,
+        max_features=None,
+        prune_at=2000000,
+        chunksize=10000,
+        hashing=False,
+        n_features=2**20,
+        alternate_sign=True,
+        **vectorizer_kwargs
+    ):
+        self.field = field
+        self.min_df = min_df
+        self.max_df = max_df
+        self.max_features = max_features
+        self.prune_at = prune_at
+        self.chunksize = chunksize
+        self.hashing = hashing
+        self.vectorizer_kwargs = vectorizer_kwargs
+        self.document_frequencies = Counter()
+        self.term_frequencies = Counter()
+        self.n_documents = 0
+
+        from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+
+        if hashing:
+            self.vectorizer = HashingVectorizer(
+                n_features=n_features,
+                alternate_sign=alternate_sign,
+                norm=None,
+                **vectorizer_kwargs
+            )
+        else:
+            self.vectorizer = None
+            self._analyzer = CountVectorizer(**vectorizer_kwargs).build_analyzer()
+
+    @property
+    def vocabulary_(self):
+        """
+        dict: Terms key-valued to their column in the document-term matrix.
+        """
+        return self.vectorizer.vocabulary_
+
+    def partial_fit(self, texts):
+        """
+        Update document frequencies with a chunk of texts.
+        The vocabulary is not usable until :meth:`finalize` is called.
+
+        Args:
+            texts (iterable):
+                Texts or :class:`Patent`.
+
+        Returns:
+            PatentVectorizer:
+                The vectorizer itself.
+        """
+        if self.hashing:
+            return self
+
+        for text in self._texts(texts):
+            terms = self._analyzer(text)
+            self.document_frequencies.update(set(terms))
+            self.term_frequencies.update(terms)
+            self.n_documents += 1
+
+        if len(self.document_frequencies) > self.prune_at:
+            kept = self.document_frequencies.most_common(
+                self.prune_at - self.prune_at // 4
+            )
+            self.document_frequencies = Counter(dict(kept))
+            self.term_frequencies = Counter(
+                {term: self.term_frequencies[term] for term, _ in kept}
+            )
+
+        return self
+
+    def finalize(self):
+        """
+        Build the vocabulary from the document frequencies gathered so far.
+
+        Returns:
+            PatentVectorizer:
+                The vectorizer itself.
+        """
+        if self.hashing:
+            return self
+
+        min_df = _absolute_df(self.min_df, self.n_documents)
+        max_df = _absolute_df(self.max_df, self.n_documents)
+
+        terms = [
+            term
+            for term, df in self.document_frequencies.items()
+            if min_df <= df <= max_df
+        ]
+
+        if self.max_features is not None:
+            terms.sort(key=lambda term: (-self.term_frequencies[term], term))
+            terms = terms[: self.max_features]
+
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        # with a fixed vocabulary, fitting only validates it
+        self.vectorizer = CountVectorizer(
+            vocabulary=sorted(terms), **self.vectorizer_kwargs
+        ).fit([])
+
+        return self
+
+    def fit(self, texts):
+        """
+        Fit the vocabulary in a single streaming pass.
+
+        Args:
+            texts (iterable):
+                Texts or :class:`Patent`.
+
+        Returns:
+            PatentVectorizer:
+                The vectorizer itself.
+        """
+        for chunk in _chunked(texts, self.chunksize):
+            self.partial_fit(chunk)
+
+        return self.finalize()
+
+    def transform(self, texts):
+        """
+        Turn texts into a document-term matrix.
+
+        Args:
+            texts (iterable):
+                Texts or :class:`Patent`.
+
+        Returns:
+            scipy.sparse.csr_matrix:
+                The document-term matrix.
+        """
+        return self.vectorizer.transform(self._texts(texts))
+
+    def transform_chunks(self, texts):
+        """
+        Stream document-term matrices, one for each chunk of texts.
+
+        Args:
+            texts (iterable):
+                Texts or :class:`Patent`.
+
+        Returns:
+            generator:
+                :class:`scipy.sparse.csr_matrix` of at most ``chunksize`` rows each.
+        """
+        for chunk in _chunked(texts, self.chunksize):
+            yield self.transform(chunk)
+
+    def transform_parallel(self, texts, n_jobs=-1):
+        """
+        Transform chunks of texts in parallel worker processes, with a ``HARD_SMART``
+        :class:`pretoText.utils.parallelism.WorkersPool`, and stack the results.
+        Workers share no state, so this scales with the number of cores,
+        especially when ``hashing`` is set.
+
+        Args:
+            texts (iterable):
+                Texts or :class:`Patent`.
+            n_jobs (int, optional):
+                The number of worker processes.
+                Defaults to -1 (automatically get *cores count* workers).
+
+        Returns:
+            scipy.sparse.csr_matrix:
+                The document-term matrix.
+        """
+        from pretoText.utils.parallelism import hire, HARD_SMART
+        from scipy import sparse
+
+        # each chunk of texts is a task of its own
+        blocks = hire(HARD_SMART, n_workers=n_jobs).perform_job(
+            _chunked(self._texts(texts), self.chunksize),
+            self.vectorizer.transform,
+            chunksize=1,
+        )
+
+        if not blocks:
+            return self.transform([])
+
+        return sparse.vstack(blocks, format="csr")
+
+    def transform_to_disk(self, texts, folder, append=False):
+        """
+        Transform texts chunk by chunk, appending each CSR block to a
+        :class:`pretoText.scidata.matrices.CSRStore` saved into a folder.
+
+        Args:
+            texts (iterable):
+                Texts or :class:`Patent`.
+            folder (str):
+                The folder of the store; it is created if missing.
+            append (bool, optional):
+                Whether to append to the store already in the folder, instead of replacing it;
+                the store must have the same vocabulary (or number of hashed features).
+                Defaults to False.
+
+        Returns:
+            :class:`pretoText.scidata.matrices.CSRStore`:
+                The store holding the document-term matrix.
+        """
+        from pretoText.scidata import matrices
+
+        if self.hashing:
+            n_columns, vocabulary = self.vectorizer.n_features, None
+        else:
+            vocabulary = sorted(self.vocabulary_, key=self.vocabulary_.get)
+            n_columns = len(vocabulary)
+
+        if append and os.path.exists(os.path.join(folder, matrices.META)):
+            store = matrices.CSRStore(folder)
+            if store.n_columns != n_columns or store.vocabulary != vocabulary:
+                raise ValueError(
+                    "The columns of the store in %s do not match the vectorizer"
+                    % folder
+                )
+        else:
+            store = matrices.CSRStore.create(
+                folder, n_columns, vocabulary, dtype=self.vectorizer.dtype
+            )
+
+        for block in self.transform_chunks(texts):
+            store.append(block)
+
+        return store
+
+    def _texts(self, texts):
+        for text in texts:
+            if isinstance(text, Patent):
+                text = getattr(text, self.field)
+            yield text or ""
+
+
+def _absolute_df(df, n_documents):
+    if isinstance(df, float):
+        return df * n_documents
+    return df
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _format_date(date):
+    return None if np.isnat(date) else str(date)
+
+
+def _infer_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    extension = name.rsplit(".", 1)[-1].lower()
+    return {"json": JSONL, "ndjson": JSONL}.get(extension, extension)
+
+
+def _open_binary(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _read_csv_record(f):
+    # a record spans more lines when a quoted field holds a line break,
+    # that is when the quotes read so far are unbalanced
+    record = f.readline()
+    while record.count(b'"') % 2:
+        line = f.readline()
+        if not line:
+            break
+        record += line
+    return record
+
+
+class _TextBuffer:
+    # the growing buffer of a text field, compressed block by block if a level is given
+
+    def __init__(self, level=None, block_size=2**14):
+        self.level = level
+        self.block_size = block_size
+        self.size = 0
+        self._pending = bytearray()
+        self._blocks = bytearray()
+        self._block_offsets = array("q", [0])
+
+    def write(self, data):
+        self._pending += data
+        self.size += len(data)
+        if self.level is not None:
+            while len(self._pending) >= self.block_size:
+                self._flush(self.block_size)
+
+    def close(self):
+        if self.level is None:
+            return np.frombuffer(self._pending, dtype=np.uint8)
+
+        if self._pending:
+            self._flush(len(self._pending))
+        return _CompressedBuffer(
+            np.frombuffer(self._blocks, dtype=np.uint8),
+            np.frombuffer(self._block_offsets, dtype=np.int64),
+            self.block_size,
+            self.size,
+        )
+
+    def _flush(self, size):
+        self._blocks += zlib.compress(bytes(self._pending[:size]), self.level)
+        self._block_offsets.append(len(self._blocks))
+        del self._pending[:size]
+
+
+class _CompressedBuffer:
+    # a read-only bytes buffer made of blocks of block_size bytes compressed one by one
+
+    def __init__(self, blocks, block_offsets, block_size, size):
+        self.blocks = blocks
+        self.block_offsets = block_offsets
+        self.block_size = block_size
+        self.size = size
+        self._cache = (None, b"")
+
+    @property
+    def nbytes(self):
+        return self.blocks.nbytes + self.block_offsets.nbytes
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        start, stop, _ = key.indices(self.size)
+        if start >= stop:
+            return b""
+
+        parts = []
+        for i in range(start // self.block_size, (stop - 1) // self.block_size + 1):
+            base = i * self.block_size
+            parts.append(self._block(i)[max(start - base, 0) : stop - base])
+        return parts[0] if len(parts) == 1 else b"".join(parts)
 
+    def _block(self, i):
+        index, data = self._cache
+        if index != i:
+            data = zlib.decompress(
+                self.blocks[self.block_offsets[i] : self.block_offsets[i + 1]]
+            )
+            self._cache = (i, data)
+        return data
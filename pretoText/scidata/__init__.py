@@ -1,3 +1,5 @@
-import lazy_import
+from pretoText._lazy import lazy_submodules
 
-lazy_import.lazy_module("pretoText.scidata.Patent")
+__getattr__, __dir__ = lazy_submodules(
+    __name__, ["Patent", "dataframes", "graphs", "matrices", "neighbours", "vectors"]
+)
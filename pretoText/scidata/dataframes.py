@@ -0,0 +1,253 @@
+from scipy import sparse
+import numpy as np
+import pandas as pd
+
+
+__all__ = [
+    "spread_col",
+    "column_shift",
+    "target_column",
+    "sparse_matrix_from_text",
+    "target_values_vec",
+]
+
+
+def spread_col(df, col_name):
+    """Adds a number of columns equal to the number of values of the column ``col_name``.\
+       Each of these new columns has a one at a row if that given row has that value in ``col_name``\
+       and a zero otherwise.
+
+
+    Args:
+        df (``pandas.DataFrame``): The dataframe to work with.
+        col_name (str): The column to spread.
+
+    Returns:
+        ``pandas.DataFrame``: A new modified dataframe.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        test_df=pandas.DataFrame(["si","no","si","no","si","si"],columns=['col'] )
+
+        ====  =====
+          ..  col
+        ====  =====
+           0  si
+           1  no
+           2  si
+           3  no
+           4  si
+           5  si
+        ====  =====
+
+        test_df=spread_col(test_df)
+
+        ====  =====  ====  ====
+          ..  col      no    si
+        ====  =====  ====  ====
+           0  si        0     1
+           1  no        1     0
+           2  si        0     1
+           3  no        1     0
+           4  si        0     1
+           5  si        0     1
+        ====  =====  ====  ====
+
+
+    """
+    df[col_name] = pd.Categorical(df[col_name])
+    df_dummies = pd.get_dummies(df[col_name], dtype="float64")
+    output = pd.concat([df, df_dummies], axis=1)
+    return output
+
+
+def column_shift(df, col_name, shift_len, absolute_value=False):
+    """Adds a columns to the dataframe which is an old one shifted by a signed shift forward or backward,\
+       if the absolute value parameter is set to True the new column is the sum of the shift backward and \
+       forward of length shift len where all nonzero values are replaced by the value one.
+
+    Args:
+        df (``pandas.DataFrame``):
+            The dataframe to modify.
+        col_name (str):
+            Column to shift.
+        shift_len (int):
+            Length of the shift.
+        absolute_value (bool, optional):
+            If set to True acts as in the description.
+            Defaults to False.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        test_df=pandas.DataFrame(list(range(6)),columns=['col'] )
+
+        ====  =====
+          ..    col
+        ====  =====
+           0      0
+           1      1
+           2      2
+           3      3
+           4      4
+           5      5
+           6      6
+        ====  =====
+
+        column_shift(test_df,'col',4)
+
+        ====  =====  =======
+          ..    col    col_4
+        ====  =====  =======
+           0      0        4
+           1      1        5
+           2      2        0
+           3      3        0
+           4      4        0
+           5      5        0
+        ====  =====  =======
+
+
+    """
+    bool_to_float = df[col_name]
+    shifted = bool_to_float.shift(periods=-shift_len, fill_value=0.0)
+    if not absolute_value:
+        df[col_name + "_" + str(shift_len)] = shifted
+    else:
+        oppos_shifted = bool_to_float.shift(periods=shift_len, fill_value=0.0)
+        abs_shifted = shifted.add(oppos_shifted)
+        df[col_name + "_abs_" + str(abs(shift_len))] = abs_shifted.replace(2.0, 1.0)
+
+
+def target_column(df: pd.DataFrame, col_name, targets):
+    """Given a data frame creates a new column, where at n-th position there is a one in case a\
+       word from target is present in the n-th element of the iterable and zero otherwise.
+
+    Args:
+        df (``pandas.DataFrame``): The dataframe to add the column to.
+        col_name (str): Iterable of strings.
+        targets (list): List of the words that generate a one in the output.
+    """
+    df["target"] = df[col_name].isin(targets).astype(int)
+
+
+def sparse_matrix_from_text(doc_list, hashing=False, n_jobs=1, **vectorizer_kwargs):
+    """Turns an input list of text, into a bag of words representation \
+       stored in a sparse matrix.
+
+    Texts are vectorized chunk by chunk by a :class:`pretoText.scidata.Patent.PatentVectorizer`: \
+    the vocabulary is fitted in a first streaming pass, or, with ``hashing``, not fitted at all \
+    so that texts are read once and chunks can be transformed by parallel workers.
+
+    Args:
+        doc_list (list): list of strings; an iterator is read into a list first, since \
+            the vocabulary is fitted in a pass of its own, unless ``hashing`` is set.
+        hashing (bool, optional):
+            Whether to use the hashing trick instead of a vocabulary.
+            Defaults to False.
+        n_jobs (int, optional):
+            The number of worker processes transforming chunks; -1 for as many as cores.
+            Defaults to 1.
+
+    Any further argument (e.g. ``chunksize`` or ``min_df``) is given to the ``PatentVectorizer``.
+
+    Returns:
+        tuple: A pair composed by scipy.sparse.csr_matrix matrix in the first entry, and a \
+        sklearn.CountVectorizer (a sklearn.HashingVectorizer if ``hashing`` is set).
+    """
+    from pretoText.scidata.Patent import PatentVectorizer
+
+    vectorizer = PatentVectorizer(hashing=hashing, **vectorizer_kwargs)
+    if not hashing:
+        if iter(doc_list) is doc_list:
+            # an iterator would be exhausted by fitting, leaving no text to transform
+            doc_list = list(doc_list)
+        vectorizer.fit(doc_list)
+
+    if n_jobs == 1:
+        X = vectorizer.transform(doc_list)
+    else:
+        X = vectorizer.transform_parallel(doc_list, n_jobs=n_jobs)
+
+    return X, vectorizer.vectorizer
+
+
+def target_values_vec(
+    doc_list, targets, matrix=None, vocabulary=None, vectorizer=None, block_size=100000
+):
+    """Given an iterable of strings returns a numpy array of the same length as the input one, \
+    where at n-th position there is a one in case a word from target is present\
+    in the n-th element of the iterable and zero otherwise.
+
+    Words of ``doc_list`` are split on spaces. If the document-term matrix of the documents \
+    is given instead, no text is parsed: targets are mapped to its columns once and labels \
+    are the rows having a nonzero count in any of those columns.
+
+    Both ways agree only as far as the terms of the matrix are the words of the texts: \
+    a vectorizer usually lowercases words and splits them on punctuation too. Given the \
+    ``vectorizer`` of the matrix, targets are preprocessed as its documents were (e.g. \
+    ``Pump`` is looked up as ``pump``); otherwise they are looked up as they are.
+
+    Args:
+        doc_list (iterable): Iterable of strings; ignored if ``matrix`` is given.
+        targets (list): List of the words that generate a one in the output.
+        matrix (scipy.sparse.spmatrix or :class:`pretoText.scidata.matrices.CSRStore`, optional):
+            The document-term matrix of the documents, read by blocks of ``block_size`` rows.
+            Defaults to None.
+        vocabulary (list or dict, optional):
+            The terms of the columns of ``matrix``, in order, or terms key-valued to their column.
+            Defaults to None (the vocabulary of the store, or of ``vectorizer``).
+        vectorizer (sklearn.feature_extraction.text.CountVectorizer, optional):
+            The vectorizer which built ``matrix``, such as the one returned by
+            :func:`sparse_matrix_from_text`, or a :class:`pretoText.scidata.Patent.PatentVectorizer`.
+            Defaults to None.
+        block_size (int, optional):
+            The number of rows of ``matrix`` labelled at once.
+            Defaults to 100000.
+
+    Returns:
+        np.array: Array built as in the description.
+    """
+    if matrix is None:
+        targets = frozenset(targets)
+        return np.fromiter(
+            (not targets.isdisjoint(doc.split(" ")) for doc in doc_list), dtype=int
+        )
+
+    if vectorizer is not None:
+        vectorizer = getattr(vectorizer, "vectorizer", vectorizer)
+        preprocess = vectorizer.build_preprocessor()
+        targets = [preprocess(target) for target in targets]
+
+    if vocabulary is None:
+        vocabulary = getattr(matrix, "vocabulary", None)
+    if vocabulary is None:
+        vocabulary = getattr(vectorizer, "vocabulary_", None)
+    if vocabulary is None:
+        raise ValueError("The vocabulary of the matrix columns is required")
+    if not isinstance(vocabulary, dict):
+        vocabulary = {term: column for column, term in enumerate(vocabulary)}
+
+    columns = np.array(
+        sorted({vocabulary[t] for t in targets if t in vocabulary}), dtype=np.int64
+    )
+
+    if hasattr(matrix, "iter_blocks"):
+        blocks = matrix.iter_blocks(block_size)
+    else:
+        matrix = sparse.csr_matrix(matrix)
+        blocks = (
+            matrix[start : start + block_size]
+            for start in range(0, matrix.shape[0], block_size)
+        )
+
+    return np.concatenate(
+        [np.zeros(0, dtype=int)] + [_any_column(block, columns) for block in blocks]
+    )
+
+
+def _any_column(block, columns):
+    block = sparse.csr_matrix(block)[:, columns]
+    block.eliminate_zeros()
+    return (block.getnnz(axis=1) > 0).astype(int)
@@ -0,0 +1,101 @@
+from scipy import sparse
+import numpy as np
+import pandas as pd
+
+
+__all__ = ["convert_df_to_adjacency_df", "convert_matrix_to_adjacency_df"]
+
+
+def convert_df_to_adjacency_df(df, asymmetric=False, threshold=None):
+    """
+    Turns a square dataframe, such as a similarity matrix, into one of pairs of its elements.
+
+    Args:
+        df (pd.DataFrame):
+            The square dataframe to work with; its index labels the elements.
+        asymmetric (bool, optional):
+            The type of adjacency matrix to infer.
+            Defaults to False.
+        threshold (float, optional):
+            If specified, only pairs whose weight is greater or equal to it are kept.
+            Defaults to None.
+
+    Returns:
+        pd.DataFrame:
+            The adjacency dataframe with columns=["a","b","w"].
+    """
+    return convert_matrix_to_adjacency_df(
+        df.values, labels=df.index, asymmetric=asymmetric, threshold=threshold
+    )
+
+
+def convert_matrix_to_adjacency_df(
+    matrix, labels=None, asymmetric=False, threshold=None
+):
+    """
+    Turns a square matrix, dense or sparse, into a dataframe of the pairs of elements
+    having a nonzero weight, by plain index arithmetic.
+
+    If symmetric, as for an undirected graph, each pair is given once from the upper triangle
+    (diagonal included) and, when both entries of a pair are set, the weight is taken from
+    the lower triangle. If asymmetric, as for a directed graph, every nonzero entry is a pair.
+    Pairs are given in row-major order.
+
+    Args:
+        matrix (numpy.ndarray or scipy.sparse.spmatrix):
+            The square matrix to work with.
+        labels (list, optional):
+            The labels of rows and columns, used instead of their positions.
+            Defaults to None.
+        asymmetric (bool, optional):
+            The type of adjacency matrix to infer.
+            Defaults to False.
+        threshold (float, optional):
+            If specified, only pairs whose weight is greater or equal to it are kept.
+            Defaults to None.
+
+    Returns:
+        pd.DataFrame:
+            The adjacency dataframe with columns=["a","b","w"].
+    """
+    if matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("The matrix must be square, got shape %s" % (matrix.shape,))
+
+    if sparse.issparse(matrix):
+        matrix = sparse.coo_matrix(matrix)
+        matrix.sum_duplicates()
+        rows, columns, weights = matrix.row, matrix.col, matrix.data
+        nonzero = weights != 0
+        rows, columns, weights = rows[nonzero], columns[nonzero], weights[nonzero]
+    else:
+        matrix = np.asarray(matrix)
+        rows, columns = np.nonzero(matrix)
+        weights = matrix[rows, columns]
+
+    rows = rows.astype(np.int64)
+    columns = columns.astype(np.int64)
+
+    if not asymmetric:
+        lower = rows > columns
+        rows, columns = np.where(lower, columns, rows), np.where(lower, rows, columns)
+        # lower triangle entries come first, so they win among duplicates
+        order = np.lexsort((~lower, columns, rows))
+        rows, columns, weights = rows[order], columns[order], weights[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (columns[1:] != columns[:-1])
+        rows, columns, weights = rows[first], columns[first], weights[first]
+    else:
+        order = np.lexsort((columns, rows))
+        rows, columns, weights = rows[order], columns[order], weights[order]
+
+    if threshold is not None:
+        keep = weights >= threshold
+        rows, columns, weights = rows[keep], columns[keep], weights[keep]
+
+    if labels is not None:
+        labels = np.asarray(labels)
+        rows, columns = labels[rows], labels[columns]
+
+    return pd.DataFrame(
+        {"a": rows, "b": columns, "w": weights}, columns=["a", "b", "w"]
+    )
@@ -0,0 +1,294 @@
+from scipy import sparse
+import io
+import json
+import numpy as np
+import os
+import shutil
+
+
+__all__ = ["CSRStore", "save_csr"]
+
+
+INDPTR = "indptr.npy"
+INDICES = "indices.npy"
+DATA = "data.npy"
+VOCABULARY = "vocabulary.txt"
+META = "meta.json"
+
+
+class CSRStore:
+    """
+    A document-term matrix persisted on disk in *CSR* format, which is opened by memory-mapping.
+
+    A store is a folder holding ``indptr``, ``indices`` and ``data`` of the matrix
+    as separate ``.npy`` files, the optional vocabulary as a text file with one term per line
+    (the term of column ``i`` at line ``i``) and a small ``meta.json``.
+    Opening a store takes milliseconds whatever its size, since nothing is read until needed:
+    slicing rows only reads those rows from disk.
+    New rows can be appended, e.g. as new patents arrive.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        store = save_csr("dtm", X, vocabulary=terms)
+
+        store = CSRStore("dtm")
+        store[1000:2000]  # a scipy.sparse.csr_matrix of 1000 rows
+        store.append(X_new)
+
+    Args:
+        folder (str):
+            The folder of the store.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._open()
+
+    @classmethod
+    def create(cls, folder, n_columns, vocabulary=None, dtype=np.int64):
+        """
+        Create an empty store, with no rows.
+
+        Args:
+            folder (str):
+                The folder of the store; it is created if missing.
+            n_columns (int):
+                The number of columns of the matrix.
+            vocabulary (list, optional):
+                The terms of the columns, in order.
+                Defaults to None.
+            dtype (numpy.dtype, optional):
+                The type of the values of the matrix.
+                Defaults to ``numpy.int64``.
+
+        Returns:
+            CSRStore:
+                The empty store.
+        """
+        if vocabulary is not None and len(vocabulary) != n_columns:
+            raise ValueError("The vocabulary must have a term for each column")
+
+        os.makedirs(folder, exist_ok=True)
+
+        _write_npy(os.path.join(folder, INDPTR), np.zeros(1, dtype=np.int64))
+        _write_npy(os.path.join(folder, INDICES), np.zeros(0, dtype=np.int32))
+        _write_npy(os.path.join(folder, DATA), np.zeros(0, dtype=dtype))
+
+        if vocabulary is not None:
+            with open(os.path.join(folder, VOCABULARY), "w", encoding="utf-8") as f:
+                f.writelines(term + "\n" for term in vocabulary)
+        elif os.path.exists(os.path.join(folder, VOCABULARY)):
+            os.remove(os.path.join(folder, VOCABULARY))
+
+        with open(os.path.join(folder, META), "w") as f:
+            json.dump({"n_columns": int(n_columns)}, f)
+
+        return cls(folder)
+
+    @property
+    def shape(self):
+        """
+        tuple: The number of rows and columns of the matrix.
+        """
+        return (len(self.indptr) - 1, self.n_columns)
+
+    @property
+    def vocabulary(self):
+        """
+        list: The terms of the columns, in order, or None if the store has no vocabulary.
+        """
+        path = os.path.join(self.folder, VOCABULARY)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("CSRStore supports contiguous slices only")
+            stop = max(start, stop)
+        else:
+            start = key + len(self) if key < 0 else key
+            stop = start + 1
+            if not 0 <= start < len(self):
+                raise IndexError("CSRStore index out of range")
+
+        indptr = np.asarray(self.indptr[start : stop + 1])
+        begin, end = indptr[0], indptr[-1]
+
+        return sparse.csr_matrix(
+            (self.data[begin:end], self.indices[begin:end], indptr - begin),
+            shape=(stop - start, self.n_columns),
+        )
+
+    def to_csr(self):
+        """
+        Get the whole matrix, still backed by the memory-mapped files.
+
+        Returns:
+            scipy.sparse.csr_matrix:
+                The matrix of the store.
+        """
+        return self[:]
+
+    def iter_blocks(self, size):
+        """
+        Stream the matrix in blocks of rows.
+
+        Args:
+            size (int):
+                The number of rows of each block.
+
+        Returns:
+            generator:
+                :class:`scipy.sparse.csr_matrix` of at most ``size`` rows each.
+        """
+        for start in range(0, len(self), size):
+            yield self[start : start + size]
+
+    def append(self, X):
+        """
+        Append the rows of a matrix to the store.
+
+        Args:
+            X (scipy.sparse.spmatrix):
+                The rows to append, with as many columns as the store, and values which can be
+                cast to the type of the store within their kind (e.g. integers to floats).
+
+        Returns:
+            CSRStore:
+                The store itself.
+        """
+        X = sparse.csr_matrix(X)
+        if X.shape[1] != self.n_columns:
+            raise ValueError(
+                "Expected %d columns, got %d" % (self.n_columns, X.shape[1])
+            )
+        if not np.can_cast(X.dtype, self.data.dtype, "same_kind"):
+            raise ValueError(
+                "Cannot append %s values to a store of %s values"
+                % (X.dtype, self.data.dtype)
+            )
+
+        X.sort_indices()
+        last = int(self.indptr[-1])
+        leftovers = len(self.indices) > last or len(self.data) > last
+
+        # release the memory maps before growing the files
+        self.indptr = self.indices = self.data = None
+
+        # new rows only become visible once indptr is extended, hence it is written last;
+        # entries left behind by an interrupted append are dropped first
+        if leftovers:
+            _truncate_npy(os.path.join(self.folder, INDICES), last)
+            _truncate_npy(os.path.join(self.folder, DATA), last)
+
+        _append_npy(os.path.join(self.folder, INDICES), X.indices)
+        _append_npy(os.path.join(self.folder, DATA), X.data)
+        _append_npy(os.path.join(self.folder, INDPTR), X.indptr[1:] + last)
+
+        self._open()
+
+        return self
+
+    def _open(self):
+        with open(os.path.join(self.folder, META)) as f:
+            self.n_columns = json.load(f)["n_columns"]
+
+        self.indptr = np.load(os.path.join(self.folder, INDPTR), mmap_mode="r")
+        self.indices = np.load(os.path.join(self.folder, INDICES), mmap_mode="r")
+        self.data = np.load(os.path.join(self.folder, DATA), mmap_mode="r")
+
+
+def save_csr(folder, X, vocabulary=None):
+    """
+    Save a sparse matrix as a :class:`CSRStore`, replacing any matrix already in the folder.
+
+    Args:
+        folder (str):
+            The folder of the store; it is created if missing.
+        X (scipy.sparse.spmatrix):
+            The matrix to save.
+        vocabulary (list or dict, optional):
+            The terms of the columns, in order, or terms key-valued to their column
+            as in ``CountVectorizer.vocabulary_``.
+            Defaults to None.
+
+    Returns:
+        CSRStore:
+            The store holding the matrix.
+    """
+    if isinstance(vocabulary, dict):
+        vocabulary = sorted(vocabulary, key=vocabulary.get)
+
+    store = CSRStore.create(folder, X.shape[1], vocabulary=vocabulary, dtype=X.dtype)
+    return store.append(X)
+
+
+def _header(dtype, length):
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header,
+        {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+            "fortran_order": False,
+            "shape": (length,),
+        },
+    )
+    return header.getvalue()
+
+
+def _write_npy(path, values):
+    with open(path, "wb") as f:
+        f.write(_header(values.dtype, len(values)))
+        f.write(np.ascontiguousarray(values).tobytes())
+
+
+def _append_npy(path, values):
+    with open(path, "r+b") as f:
+        np.lib.format.read_magic(f)
+        (length,), _, dtype = np.lib.format.read_array_header_1_0(f)
+        offset = f.tell()
+
+        f.seek(0, os.SEEK_END)
+        f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+        # the header is padded so that the length can usually grow in place
+        header = _header(dtype, length + len(values))
+        if len(header) == offset:
+            f.seek(0)
+            f.write(header)
+            return
+
+    tmp_path = path + ".tmp"
+    with open(path, "rb") as source, open(tmp_path, "wb") as target:
+        source.seek(offset)
+        target.write(header)
+        shutil.copyfileobj(source, target)
+    os.replace(tmp_path, path)
+
+
+def _truncate_npy(path, length):
+    with open(path, "r+b") as f:
+        np.lib.format.read_magic(f)
+        _, _, dtype = np.lib.format.read_array_header_1_0(f)
+        offset = f.tell()
+
+        header = _header(dtype, length)
+        if len(header) == offset:
+            f.truncate(offset + length * dtype.itemsize)
+            f.seek(0)
+            f.write(header)
+            return
+
+    values = np.load(path, mmap_mode="r")[:length]
+    _write_npy(path + ".tmp", values)
+    del values
+    os.replace(path + ".tmp", path)
@@ -0,0 +1,375 @@
+from pretoText.scidata.vectors import normalize_rows
+from scipy import sparse
+import numpy as np
+import os
+import pandas as pd
+
+
+__all__ = ["CosineIndex", "top_k_cosine_edges"]
+
+
+def top_k_cosine_edges(
+    X,
+    labels=None,
+    k=10,
+    threshold=None,
+    block_size=1024,
+    symmetric=True,
+    dtype=np.float32,
+    save=None,
+):
+    """
+    Find the most similar rows of a matrix by *cosine similarity*, as an edge list.
+
+    Rows are normalized once, then similarities are computed by blocks of ``block_size`` rows
+    against the whole matrix, and only the best ``k`` neighbours of each row (or the ones above
+    ``threshold``) are kept. Hence the full similarity matrix is never built:
+    memory is O(``block_size`` * N) while computing and O(N * ``k``) for the output.
+
+    Args:
+        X (numpy.ndarray or scipy.sparse.spmatrix):
+            The matrix whose rows are vectors, such as word embeddings or a document-term matrix.
+        labels (list, optional):
+            The labels of the rows, used in the output instead of their positions.
+            Defaults to None.
+        k (int, optional):
+            The number of neighbours kept for each row; if None, all of them are candidates.
+            Defaults to 10.
+        threshold (float, optional):
+            If specified, only similarities greater or equal to it are kept.
+            Defaults to None.
+        block_size (int, optional):
+            The number of rows compared at once.
+            Defaults to 1024.
+        symmetric (bool, optional):
+            Whether a pair of rows is given only once, whatever the order,
+            as in an undirected graph.
+            Defaults to True.
+        dtype (numpy.dtype, optional):
+            The type used in computations.
+            Defaults to ``numpy.float32``.
+        save (str, optional):
+            If specified, the edges are saved in that file, whose extension picks the format
+            (see :func:`pretoText.utils.exporters.save_edges`). If not ``symmetric``, the edges
+            of each block are written as soon as they are computed, block after block, so the file
+            is sorted within blocks only; else pairs are deduplicated over all the blocks first,
+            and the sorted edges are written at once.
+            Defaults to None.
+
+    Returns:
+        :class:`pandas.DataFrame`:
+            Columns ``a``, ``b`` and ``w`` hold the pairs of rows and their similarity score,
+            sorted from the most similar.
+    """
+    if k is not None and k < 1:
+        raise ValueError("k must be a positive number of neighbours")
+
+    X = normalize_rows(X, dtype=dtype)
+    n_rows = X.shape[0]
+
+    blocks = _top_k_blocks(X, k, threshold, block_size)
+    if save and not symmetric:
+        blocks = _save_blocks(blocks, save, labels)
+
+    sources, targets, weights = [], [], []
+    for a, b, w in blocks:
+        sources.append(a)
+        targets.append(b)
+        weights.append(w)
+
+    a = np.concatenate(sources) if sources else np.zeros(0, dtype=np.int64)
+    b = np.concatenate(targets) if targets else np.zeros(0, dtype=np.int64)
+    w = np.concatenate(weights) if weights else np.zeros(0, dtype=dtype)
+
+    if symmetric:
+        a, b = np.minimum(a, b), np.maximum(a, b)
+        _, unique = np.unique(a * n_rows + b, return_index=True)
+        a, b, w = a[unique], b[unique], w[unique]
+
+    edges = _edges_frame(a, b, w, labels)
+
+    if save and symmetric:
+        from pretoText.utils import exporters
+
+        exporters.save_edges(edges, save)
+
+    return edges
+
+
+class CosineIndex:
+    """
+    An approximate nearest-neighbours index for *cosine similarity* queries,
+    such as "which terms are the closest to this one".
+
+    Vectors are partitioned by a spherical *k-means* into ``n_lists`` inverted lists,
+    stored one after the other in a single contiguous matrix.
+    A query only scans the ``n_probe`` lists whose centroids are the most similar to it:
+    the higher ``n_probe``, the better the recall and the slower the query.
+    With ``n_probe`` equal to ``n_lists`` the search is exact.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        index = CosineIndex(n_lists=1024).build(vectors, labels=terms)
+        index.save("terms_index")
+
+        index = CosineIndex.load("terms_index")
+        labels, scores = index.query(vector, k=10, n_probe=16)
+
+    Args:
+        n_lists (int, optional):
+            The number of inverted lists; around the square root of the number of vectors is a good fit.
+            Defaults to 256.
+        n_probe (int, optional):
+            The default number of lists scanned by a query.
+            Defaults to 8.
+        n_iter (int, optional):
+            The number of *k-means* iterations.
+            Defaults to 10.
+        train_size (int, optional):
+            The maximum number of vectors sampled to train the *k-means*.
+            Defaults to 100000.
+        seed (int, optional):
+            The seed of the random sampling.
+            Defaults to 0.
+    """
+
+    def __init__(self, n_lists=256, n_probe=8, n_iter=10, train_size=100000, seed=0):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.train_size = train_size
+        self.seed = seed
+        self.centroids = None
+        self.vectors = None
+        self.ids = None
+        self.offsets = None
+        self.labels = None
+
+    def build(self, vectors, labels=None, block_size=65536):
+        """
+        Build the index from a set of vectors.
+
+        Args:
+            vectors (numpy.ndarray):
+                The vectors to index, one per row.
+            labels (list, optional):
+                The labels of the vectors, returned by queries instead of their positions.
+                Defaults to None.
+            block_size (int, optional):
+                The number of vectors assigned to lists at once.
+                Defaults to 65536.
+
+        Returns:
+            CosineIndex:
+                The index itself.
+        """
+        vectors = normalize_rows(vectors)
+        rng = np.random.RandomState(self.seed)
+        n_lists = min(self.n_lists, len(vectors))
+
+        sample = vectors[
+            rng.choice(len(vectors), min(self.train_size, len(vectors)), replace=False)
+        ]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+
+        for _ in range(self.n_iter):
+            assignments = _nearest(sample, centroids, block_size)
+            members = sparse.csr_matrix(
+                (
+                    np.ones(len(sample), dtype=sample.dtype),
+                    (assignments, np.arange(len(sample))),
+                ),
+                shape=(n_lists, len(sample)),
+            )
+            sums = np.asarray(members.dot(sample))
+            counts = np.bincount(assignments, minlength=n_lists)
+
+            # empty lists are given a random vector again
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(len(sample), empty.sum())]
+            centroids = normalize_rows(sums)
+
+        assignments = _nearest(vectors, centroids, block_size)
+        ids = np.argsort(assignments, kind="stable")
+
+        self.centroids = centroids
+        self.vectors = vectors[ids]
+        self.ids = ids
+        self.offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(assignments, minlength=n_lists))]
+        )
+        self.labels = None if labels is None else np.asarray(labels)
+
+        return self
+
+    def query(self, vector, k=10, n_probe=None):
+        """
+        Find the vectors most similar to the given one.
+
+        Args:
+            vector (numpy.ndarray):
+                The query vector.
+            k (int, optional):
+                The number of neighbours to return.
+                Defaults to 10.
+            n_probe (int, optional):
+                The number of lists to scan.
+                Defaults to None (the one given to the index).
+
+        Returns:
+            tuple:
+                The labels (or positions) of the neighbours, and their similarity scores,
+                from the most similar.
+        """
+        n_probe = min(self.n_probe if n_probe is None else n_probe, len(self.centroids))
+        vector = normalize_rows(np.asarray(vector).reshape(1, -1))[0]
+
+        lists = np.argpartition(-self.centroids.dot(vector), n_probe - 1)[:n_probe]
+        candidates = np.concatenate(
+            [np.arange(self.offsets[i], self.offsets[i + 1]) for i in lists]
+        )
+
+        scores = self.vectors[candidates].dot(vector)
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")]
+
+        found = self.ids[candidates[best]]
+        if self.labels is not None:
+            found = self.labels[found]
+
+        return found, scores[best]
+
+    def save(self, folder):
+        """
+        Save the index into a folder, as ``.npy`` files; text labels are saved as a text file
+        with one label per line.
+
+        Args:
+            folder (str):
+                The folder where to save the index; it is created if missing.
+        """
+        os.makedirs(folder, exist_ok=True)
+
+        for name in ("centroids", "vectors", "ids", "offsets"):
+            np.save(os.path.join(folder, name + ".npy"), getattr(self, name))
+
+        np.save(
+            os.path.join(folder, "settings.npy"),
+            np.array(
+                [self.n_lists, self.n_probe, self.n_iter, self.train_size, self.seed]
+            ),
+        )
+
+        for name in ("labels.txt", "labels.npy"):
+            path = os.path.join(folder, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+        if self.labels is not None and self.labels.dtype.kind in "OUS":
+            with open(os.path.join(folder, "labels.txt"), "w", encoding="utf-8") as f:
+                f.writelines(str(label) + "\n" for label in self.labels)
+        elif self.labels is not None:
+            np.save(os.path.join(folder, "labels.npy"), self.labels)
+
+    @classmethod
+    def load(cls, folder, mmap=True):
+        """
+        Load an index saved by :meth:`save`.
+
+        Args:
+            folder (str):
+                The folder of the index.
+            mmap (bool, optional):
+                Whether to memory-map the vectors instead of reading them at once.
+                Defaults to True.
+
+        Returns:
+            CosineIndex:
+                The loaded index.
+        """
+        settings = np.load(os.path.join(folder, "settings.npy")).tolist()
+        index = cls(*settings)
+
+        for name in ("centroids", "vectors", "ids", "offsets"):
+            path = os.path.join(folder, name + ".npy")
+            setattr(index, name, np.load(path, mmap_mode="r" if mmap else None))
+
+        path = os.path.join(folder, "labels.txt")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                index.labels = np.array(f.read().splitlines())
+
+        path = os.path.join(folder, "labels.npy")
+        if os.path.exists(path):
+            index.labels = np.load(path)
+
+        return index
+
+
+def _nearest(vectors, centroids, block_size):
+    return np.concatenate(
+        [
+            np.argmax(vectors[start : start + block_size].dot(centroids.T), axis=1)
+            for start in range(0, len(vectors), block_size)
+        ]
+    )
+
+
+def _top_k_blocks(X, k, threshold, block_size):
+    n_rows = X.shape[0]
+
+    for start in range(0, n_rows, block_size):
+        stop = min(start + block_size, n_rows)
+        block = X[start:stop].dot(X.T)
+        block = block.toarray() if sparse.issparse(block) else np.asarray(block)
+
+        # a row is not a neighbour of itself
+        rows = np.arange(stop - start)
+        block[rows, rows + start] = -np.inf
+
+        if k is None or k >= n_rows - 1:
+            columns = np.tile(np.arange(n_rows), (stop - start, 1))
+        else:
+            columns = np.argpartition(-block, k - 1, axis=1)[:, :k]
+
+        scores = np.take_along_axis(block, columns, axis=1)
+
+        keep = np.isfinite(scores)
+        if threshold is not None:
+            keep &= scores >= threshold
+
+        yield (
+            np.broadcast_to((rows + start)[:, None], columns.shape)[keep],
+            columns[keep],
+            scores[keep],
+        )
+
+
+def _save_blocks(blocks, path, labels):
+    # edges of each block are written as soon as they are computed, and kept for the output
+    from pretoText.utils import exporters
+
+    saved = []
+
+    def frames():
+        for a, b, w in blocks:
+            saved.append((a, b, w))
+            yield _edges_frame(a, b, w, labels)
+
+    exporters.save_edges(frames(), path)
+    return saved
+
+
+def _edges_frame(a, b, w, labels):
+    order = np.argsort(-w, kind="stable")
+    a, b, w = a[order], b[order], w[order]
+
+    if labels is not None:
+        labels = np.asarray(labels)
+        a, b = labels[a], labels[b]
+
+    return pd.DataFrame({"a": a, "b": b, "w": w}, columns=["a", "b", "w"])
@@ -0,0 +1,145 @@
+from scipy import sparse
+import numpy as np
+
+
+__all__ = ["cosine_similarity", "normalize_rows", "pairwise_cosine_similarity"]
+
+
+def normalize_rows(X, dtype=np.float32):
+    """
+    Scale each row of a matrix to unit euclidean norm, so that cosine similarities
+    become plain dot products. Rows of all zeros are left as they are.
+
+    Args:
+        X (numpy.ndarray or scipy.sparse.spmatrix):
+            The matrix whose rows are vectors.
+        dtype (numpy.dtype, optional):
+            The type of the normalized matrix.
+            Defaults to ``numpy.float32``.
+
+    Returns:
+        numpy.ndarray or scipy.sparse.csr_matrix:
+            The normalized matrix, sparse if ``X`` is sparse.
+    """
+    if sparse.issparse(X):
+        X = sparse.csr_matrix(X, dtype=dtype)
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).dot(X).tocsr().astype(dtype)
+
+    X = np.asarray(X, dtype=dtype)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return X / norms
+
+
+def cosine_similarity(v1, v2, dtype=np.float64, out=None):
+    """
+    Compute cosine similarity of v1 to v2 as:
+
+    .. math::
+
+        \\frac{(v1 \\cdot v2)}{{||v1||*||v2||}}
+
+    Both ``v1`` and ``v2`` may be single vectors (1-D) or matrices of vectors, one per row
+    (2-D arrays or sparse matrices), so that one-to-one, one-to-many and many-to-many
+    similarities are computed at once. A zero vector has a similarity of 0 with any vector.
+
+    Args:
+        v1 (numpy.ndarray or scipy.sparse.spmatrix):
+            A vector, or a matrix of vectors.
+        v2 (numpy.ndarray or scipy.sparse.spmatrix):
+            A vector, or a matrix of vectors.
+        dtype (numpy.dtype, optional):
+            The type used in computations, e.g. ``numpy.float32`` to halve memory.
+            Defaults to ``numpy.float64``.
+        out (numpy.ndarray, optional):
+            A preallocated array of the result shape and ``dtype`` where to write similarities.
+            Defaults to None.
+
+    Returns:
+        float or numpy.ndarray:
+            A float if both are vectors, an array of ``len(v2)`` (or ``len(v1)``) similarities
+            if one of them is a matrix, or a ``len(v1)`` x ``len(v2)`` matrix if both are.
+    """
+    single1, single2 = _is_vector(v1), _is_vector(v2)
+    A = normalize_rows(_as_rows(v1), dtype=dtype)
+    B = normalize_rows(_as_rows(v2), dtype=dtype)
+
+    if sparse.issparse(A) or sparse.issparse(B):
+        similarities = A.dot(B.T)
+        similarities = (
+            similarities.toarray()
+            if sparse.issparse(similarities)
+            else np.asarray(similarities)
+        )
+    elif out is not None and not (single1 or single2):
+        return np.dot(A, B.T, out=out)
+    else:
+        similarities = np.dot(A, B.T)
+
+    if single1 and single2:
+        return float(similarities[0, 0])
+    if single1 or single2:
+        similarities = similarities.ravel()
+
+    if out is not None:
+        out[...] = similarities
+        return out
+
+    return similarities
+
+
+def pairwise_cosine_similarity(X, pairs, Y=None, dtype=np.float64, block_size=4096):
+    """
+    Compute the cosine similarity of a list of pairs of rows, without building the full
+    similarity matrix: rows are normalized once and pairs are scored by blocks.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        pairwise_cosine_similarity(vectors, [(0, 1), (0, 2), (5, 3)])
+        >>> array([0.12, 0.87, 0.45])
+
+    Args:
+        X (numpy.ndarray or scipy.sparse.spmatrix):
+            The vectors of the first elements of pairs, one per row.
+        pairs (list or numpy.ndarray):
+            The pairs ``(i, j)`` of row positions to score.
+        Y (numpy.ndarray or scipy.sparse.spmatrix, optional):
+            The vectors of the second elements of pairs.
+            Defaults to None (``X`` itself).
+        dtype (numpy.dtype, optional):
+            The type used in computations.
+            Defaults to ``numpy.float64``.
+        block_size (int, optional):
+            The number of pairs scored at once.
+            Defaults to 4096.
+
+    Returns:
+        numpy.ndarray:
+            The similarity of each pair, in order.
+    """
+    A = normalize_rows(X, dtype=dtype)
+    B = A if Y is None else normalize_rows(Y, dtype=dtype)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+
+    similarities = np.empty(len(pairs), dtype=dtype)
+    for start in range(0, len(pairs), block_size):
+        i, j = pairs[start : start + block_size].T
+        if sparse.issparse(A) or sparse.issparse(B):
+            products = sparse.csr_matrix(A[i]).multiply(sparse.csr_matrix(B[j]))
+            block = np.asarray(products.sum(axis=1)).ravel()
+        else:
+            block = np.einsum("ij,ij->i", A[i], B[j])
+        similarities[start : start + len(i)] = block
+
+    return similarities
+
+
+def _is_vector(v):
+    return not sparse.issparse(v) and np.ndim(v) == 1
+
+
+def _as_rows(v):
+    return np.atleast_2d(v) if _is_vector(v) else v
@@ -0,0 +1,87 @@
+from pretoText.scidata.dataframes import (
+    sparse_matrix_from_text,
+    target_column,
+    target_values_vec,
+)
+from pretoText.scidata.matrices import save_csr, CSRStore
+from scipy import sparse
+import numpy as np
+import pandas as pd
+
+
+DOCS = ["a valve for pumps", "the rotor", "", "pumps  and valve", "rotor blade"]
+TARGETS = ["valve", "blade", "missing"]
+
+
+def _python_target_values(doc_list, targets):
+    return [int(len(set(targets).intersection(x.split(" "))) > 0) for x in doc_list]
+
+
+def test_target_values_vec_from_texts():
+    expected = _python_target_values(DOCS, TARGETS)
+
+    assert target_values_vec(DOCS, TARGETS).tolist() == expected
+    assert target_values_vec(iter(DOCS), []).tolist() == [0] * len(DOCS)
+
+
+def test_target_values_vec_from_matrix(tmp_path):
+    vocabulary = ["a", "blade", "pumps", "rotor", "valve"]
+    matrix = sparse.csr_matrix(
+        np.array([[1, 0, 1, 0, 1], [0, 0, 0, 1, 0], [0, 0, 0, 0, 0], [0, 0, 1, 0, 0]])
+    )
+    expected = [1, 0, 0, 0]
+
+    values = target_values_vec(None, TARGETS, matrix=matrix, vocabulary=vocabulary)
+    assert values.tolist() == expected
+
+    save_csr(str(tmp_path), matrix, vocabulary=vocabulary)
+    store = CSRStore(str(tmp_path))
+    assert (
+        target_values_vec(None, TARGETS, matrix=store, block_size=3).tolist()
+        == expected
+    )
+
+
+def test_target_column():
+    df = pd.DataFrame({"word": ["valve", "rotor", "blade"]}, index=[10, 11, 12])
+    target_column(df, "word", TARGETS)
+
+    assert df["target"].tolist() == [1, 0, 1]
+
+
+def test_sparse_matrix_from_text():
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    expected = CountVectorizer()
+    Y = expected.fit_transform(DOCS)
+
+    X, vectorizer = sparse_matrix_from_text(DOCS, chunksize=2)
+    assert vectorizer.vocabulary_ == expected.vocabulary_
+    assert (X != Y).nnz == 0
+
+    X, _ = sparse_matrix_from_text(iter(DOCS), hashing=True, n_features=2**8)
+    H, _ = sparse_matrix_from_text(DOCS, hashing=True, n_features=2**8, n_jobs=2)
+    assert X.shape == (len(DOCS), 2**8)
+    assert (X != H).nnz == 0
+
+
+def test_sparse_matrix_from_text_reads_iterators_once():
+    X, vectorizer = sparse_matrix_from_text(iter(DOCS))
+    Y, _ = sparse_matrix_from_text(DOCS)
+
+    assert X.shape == Y.shape == (len(DOCS), len(vectorizer.vocabulary_))
+    assert (X != Y).nnz == 0
+
+
+def test_target_values_vec_preprocesses_targets():
+    docs = ["A Pump valve", "rotor"]
+    X, vectorizer = sparse_matrix_from_text(docs)
+
+    assert target_values_vec(docs, ["Pump"]).tolist() == [1, 0]
+    assert target_values_vec(
+        None, ["Pump"], matrix=X, vectorizer=vectorizer
+    ).tolist() == [1, 0]
+    # without the vectorizer, targets are looked up as they are
+    assert target_values_vec(
+        None, ["Pump"], matrix=X, vocabulary=vectorizer.vocabulary_
+    ).tolist() == [0, 0]
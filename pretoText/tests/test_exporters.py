@@ -0,0 +1,118 @@
+from pretoText.scidata.matrices import save_csr
+from pretoText.utils.exporters import (
+    ParquetEdgeWriter,
+    save_dtm_parquet,
+    save_edges,
+)
+from scipy import sparse
+import numpy as np
+import os
+import pandas as pd
+import pytest
+
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+EDGES = pd.DataFrame({"a": ["x", "x", "y"], "b": ["y", "z", "z"], "w": [0.9, 0.5, 0.1]})
+
+
+def test_parquet_edge_writer_row_groups(tmp_path):
+    path = str(tmp_path / "edges.parquet")
+
+    with ParquetEdgeWriter(path) as writer:
+        writer.write(EDGES[:2])
+        writer.write(EDGES[2:])
+
+    table = pq.read_table(path)
+    assert pq.ParquetFile(path).num_row_groups == 2
+    assert (
+        str(table.schema.field("a").type)
+        == "dictionary<values=string, indices=int32, ordered=0>"
+    )
+    assert str(table.schema.field("w").type) == "float"
+    assert table.to_pandas().astype({"a": str, "b": str}).values.tolist() == [
+        ["x", "y", pytest.approx(0.9)],
+        ["x", "z", pytest.approx(0.5)],
+        ["y", "z", pytest.approx(0.1)],
+    ]
+
+
+def test_save_edges_picks_format_by_extension(tmp_path):
+    save_edges(EDGES, str(tmp_path / "edges.csv"))
+    save_edges([EDGES[:1], EDGES[1:]], str(tmp_path / "edges.pq"))
+
+    assert pd.read_csv(str(tmp_path / "edges.csv"), index_col=0).equals(EDGES)
+    assert len(pd.read_parquet(str(tmp_path / "edges.pq"))) == 3
+
+    with pytest.raises(ValueError):
+        save_edges(EDGES, str(tmp_path / "edges.txt"))
+
+
+def test_save_edges_empty_blocks(tmp_path):
+    empty = pd.DataFrame({"a": [], "b": [], "w": []})
+
+    save_edges([empty, EDGES, empty], str(tmp_path / "edges.parquet"))
+    save_edges(empty, str(tmp_path / "empty.parquet"))
+
+    assert len(pd.read_parquet(str(tmp_path / "edges.parquet"))) == 3
+    schema = pq.read_schema(str(tmp_path / "empty.parquet"))
+    assert str(schema.field("a").type).startswith("dictionary<values=string")
+
+
+def test_save_dtm_parquet_from_store(tmp_path):
+    X = sparse.csr_matrix(np.array([[1, 0, 2], [0, 0, 0], [0, 3, 0]]))
+    store = save_csr(str(tmp_path / "dtm"), X, vocabulary=["gear", "brake", "wheel"])
+    path = str(tmp_path / "dtm.parquet")
+
+    save_dtm_parquet(store, path, block_size=2)
+    save_dtm_parquet(sparse.coo_matrix(X), str(tmp_path / "coo.parquet"))
+
+    df = pd.read_parquet(path)
+    assert pq.ParquetFile(path).num_row_groups == 2
+    assert df.astype({"term": str}).values.tolist() == [
+        [0, "gear", 1],
+        [0, "wheel", 2],
+        [2, "brake", 3],
+    ]
+    assert pd.read_parquet(str(tmp_path / "coo.parquet"))["count"].tolist() == [1, 2, 3]
+
+
+def test_save_dtm_parquet_block_dictionaries(tmp_path):
+    vocabulary = ["term%05d" % i for i in range(20000)]
+    X = sparse.random(100, len(vocabulary), density=0.001, format="csr", random_state=0)
+    X.data[:] = 1
+    path = str(tmp_path / "dtm.parquet")
+
+    save_dtm_parquet(X, path, vocabulary=vocabulary, block_size=10)
+
+    # ten row groups of a few terms each, not ten copies of the vocabulary
+    assert os.path.getsize(path) < len("".join(vocabulary))
+    df = pd.read_parquet(path)
+    rows, columns = X.nonzero()
+    assert sorted(zip(df["document"], df["term"].astype(str))) == sorted(
+        (row, vocabulary[column]) for row, column in zip(rows, columns)
+    )
+
+
+def test_top_k_cosine_edges_save(tmp_path):
+    from pretoText.scidata.neighbours import top_k_cosine_edges
+
+    path = str(tmp_path / "ranking.parquet")
+    edges = top_k_cosine_edges(np.eye(3) + 0.1, labels=["x", "y", "z"], k=1, save=path)
+
+    assert len(pd.read_parquet(path)) == len(edges)
+
+
+def test_top_k_cosine_edges_save_by_block(tmp_path):
+    from pretoText.scidata.neighbours import top_k_cosine_edges
+
+    X = np.random.RandomState(0).rand(10, 4)
+    path = str(tmp_path / "ranking.parquet")
+    edges = top_k_cosine_edges(X, k=3, block_size=4, symmetric=False, save=path)
+
+    saved = pd.read_parquet(path)
+    assert pq.ParquetFile(path).num_row_groups == 3
+    assert sorted(map(tuple, saved.values.tolist())) == sorted(
+        map(tuple, edges.values.tolist())
+    )
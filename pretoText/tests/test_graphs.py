@@ -0,0 +1,57 @@
+from pretoText.scidata.graphs import (
+    convert_df_to_adjacency_df,
+    convert_matrix_to_adjacency_df,
+)
+from scipy import sparse
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _edge_set(edges, asymmetric=False):
+    # networkx orders edges, and the ends of undirected ones, its own way
+    return sorted(
+        (a, b, w) if asymmetric or a <= b else (b, a, w)
+        for a, b, w in edges.itertuples(index=False)
+    )
+
+
+def _networkx_adjacency_df(df, asymmetric=False):
+    graph = (nx.DiGraph if asymmetric else nx.Graph)(df)
+    return pd.DataFrame(
+        [[a, b, data["weight"]] for a, b, data in graph.edges(data=True)],
+        columns=["a", "b", "w"],
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("asymmetric", [False, True])
+def test_convert_df_to_adjacency_df_matches_networkx(seed, asymmetric):
+    rng = np.random.RandomState(seed)
+    values = rng.rand(6, 6) * (rng.rand(6, 6) > 0.4)
+    labels = list("abcdef")
+
+    for matrix in [values, values + values.T]:
+        df = pd.DataFrame(matrix, index=labels, columns=labels)
+        expected = _networkx_adjacency_df(df, asymmetric)
+        result = convert_df_to_adjacency_df(df, asymmetric=asymmetric)
+
+        assert _edge_set(result, asymmetric) == _edge_set(expected, asymmetric)
+
+
+def test_convert_matrix_to_adjacency_df_sparse_threshold():
+    matrix = sparse.csr_matrix(
+        np.array([[1.0, 0.2, 0.0], [0.2, 1.0, 0.9], [0.0, 0.9, 1.0]])
+    )
+
+    edges = convert_matrix_to_adjacency_df(
+        matrix, labels=["x", "y", "z"], threshold=0.5
+    )
+
+    assert edges.values.tolist() == [
+        ["x", "x", 1.0],
+        ["y", "y", 1.0],
+        ["y", "z", 0.9],
+        ["z", "z", 1.0],
+    ]
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+
+# seconds allowed to `import pretoText`, including the version lookup
+IMPORT_TIME_BUDGET = 0.5
+
+HEAVY_MODULES = ["nltk", "numpy", "pandas", "scipy", "sklearn", "spacy"]
+
+
+def test_import_pretoText_within_budget():
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pretoText"],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    # lines are "import time: self [us] | cumulative | imported package"
+    cumulative = [
+        int(line.split("|")[1])
+        for line in process.stderr.splitlines()
+        if line.split("|")[-1].strip() == "pretoText"
+    ]
+
+    assert cumulative[-1] / 10**6 < IMPORT_TIME_BUDGET
+
+
+def test_import_pretoText_is_lazy():
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import pretoText, sys; print(' '.join(sorted(sys.modules)))",
+        ],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    imported = set(process.stdout.split())
+    assert imported.isdisjoint(HEAVY_MODULES)
+    assert "pretoText.scidata" not in imported
@@ -0,0 +1,95 @@
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pretoText.utils import importers
+import asyncio
+import pytest
+import threading
+
+
+SHEETS = {
+    "terms": b"term,weight\npump,1\nvalve,2\n",
+    "stopwords": b"word\nthe\nof\n",
+}
+
+
+class _SheetsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        sheet = self.path.split("?")[0].strip("/")
+        with server.lock:
+            server.requests[sheet] += 1
+            server.connections.add(self.client_address)
+            first = server.requests[sheet] == 1
+
+        if sheet == "flaky" and first:
+            return self._respond(503, b"", {"Retry-After": "0"})
+        if sheet == "moved":
+            return self._respond(302, b"", {"Location": "/terms?tqx=out:csv"})
+
+        body = SHEETS.get(sheet, SHEETS["terms"])
+        etag = '"%s"' % sheet
+        if self.headers.get("If-None-Match") == etag:
+            server.not_modified += 1
+            return self._respond(304, b"", {"ETag": etag})
+        self._respond(200, body, {"ETag": etag, "Content-Type": "text/csv"})
+
+    def _respond(self, status, body, headers):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SheetsHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = Counter()
+    server.connections = set()
+    server.not_modified = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    monkeypatch.setattr(
+        importers,
+        "GSHEET_EXPORT_URL",
+        "http://127.0.0.1:%d/%%s?tqx=out:csv" % server.server_address[1],
+    )
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_dfs_from_gsheets(server, tmp_path):
+    sheets = ["terms", "stopwords", "flaky", "moved"] + [
+        "copy%d" % i for i in range(20)
+    ]
+
+    dfs = importers.get_dfs_from_gsheets(
+        sheets, cache_dir=str(tmp_path), max_connections=4, backoff=0.01
+    )
+
+    assert list(dfs[1]["word"]) == ["the", "of"]
+    assert all(list(df["term"]) == ["pump", "valve"] for df in dfs[:1] + dfs[2:])
+    # the flaky sheet was retried once, and connections were reused
+    assert server.requests["flaky"] == 2
+    assert len(server.connections) <= 4
+
+    again = importers.get_dfs_from_gsheets(sheets, cache_dir=str(tmp_path))
+
+    assert server.not_modified == len(sheets)
+    assert all(df.equals(other) for df, other in zip(dfs, again))
+
+
+def test_fetch_all_gives_up(server):
+    url = "http://127.0.0.1:%d/flaky" % server.server_address[1]
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(importers.fetch_all([url], retries=0))
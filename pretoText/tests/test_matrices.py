@@ -0,0 +1,103 @@
+from pretoText.scidata import matrices
+from pretoText.scidata.matrices import CSRStore, save_csr
+from scipy import sparse
+import numpy as np
+import pytest
+
+
+def _random_csr(n_rows, n_columns, seed):
+    return sparse.random(
+        n_rows,
+        n_columns,
+        density=0.3,
+        format="csr",
+        random_state=seed,
+        dtype=np.float32,
+    )
+
+
+def test_save_and_open_csr_store(tmp_path):
+    X = _random_csr(20, 6, seed=0)
+    folder = str(tmp_path / "dtm")
+
+    save_csr(folder, X, vocabulary={"f%d" % i: i for i in range(6)})
+    store = CSRStore(folder)
+
+    assert store.shape == (20, 6)
+    assert store.vocabulary == ["f%d" % i for i in range(6)]
+    assert isinstance(store.data, np.memmap)
+    assert (store.to_csr() != X).nnz == 0
+    assert (store[5:9] != X[5:9]).nnz == 0
+    assert (store[-1] != X[-1]).nnz == 0
+    assert sum(block.shape[0] for block in store.iter_blocks(7)) == 20
+
+    with pytest.raises(IndexError):
+        store[20]
+
+
+def test_csr_store_append(tmp_path):
+    X = _random_csr(10, 4, seed=1)
+    Y = _random_csr(5, 4, seed=2)
+    folder = str(tmp_path / "dtm")
+
+    save_csr(folder, X).append(Y)
+    store = CSRStore(folder)
+
+    assert store.vocabulary is None
+    assert (store.to_csr() != sparse.vstack([X, Y])).nnz == 0
+
+    with pytest.raises(ValueError):
+        store.append(_random_csr(1, 3, seed=3))
+
+
+def test_csr_store_append_checks_dtype(tmp_path):
+    X = sparse.csr_matrix(np.array([[1, 0], [0, 2]], dtype=np.int32))
+    store = save_csr(str(tmp_path / "dtm"), X)
+
+    with pytest.raises(ValueError):
+        store.append(_random_csr(1, 2, seed=0))
+
+    store.append(sparse.csr_matrix(np.array([[0, 3]], dtype=np.int16)))
+
+    assert store.shape == (3, 2)
+    assert store.to_csr().dtype == np.int32
+
+
+def test_save_csr_replaces_vocabulary(tmp_path):
+    folder = str(tmp_path / "dtm")
+
+    save_csr(folder, sparse.eye(3, format="csr"), vocabulary=["a", "b", "c"])
+    store = save_csr(folder, sparse.eye(2, format="csr"))
+
+    assert store.vocabulary is None
+
+
+def test_csr_store_append_after_interrupted_append(tmp_path):
+    X = _random_csr(10, 4, seed=1)
+    Y = _random_csr(5, 4, seed=2)
+    folder = str(tmp_path / "dtm")
+    store = save_csr(folder, X)
+
+    # an append interrupted before indptr was extended
+    store.indptr = store.indices = store.data = None
+    matrices._append_npy(str(tmp_path / "dtm" / matrices.INDICES), Y.indices)
+    store = CSRStore(folder)
+    assert (store.to_csr() != X).nnz == 0
+
+    store.append(Y)
+    assert (CSRStore(folder).to_csr() != sparse.vstack([X, Y])).nnz == 0
+
+
+def test_append_npy_rewrites_header_when_it_grows(tmp_path):
+    path = str(tmp_path / "values.npy")
+
+    # a compact header, with no room for the length to grow in place
+    header = b"{'descr':'<i8','fortran_order':False,'shape':(3,)}"
+    header += b" " * (64 - 10 - len(header) - 1) + b"\n"
+    with open(path, "wb") as f:
+        f.write(b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header)
+        f.write(np.arange(3, dtype="<i8").tobytes())
+
+    matrices._append_npy(path, np.arange(3, 5))
+
+    assert np.load(path).tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,69 @@
+from pretoText.scidata.neighbours import CosineIndex, top_k_cosine_edges
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+import pytest
+
+
+def test_top_k_cosine_edges_matches_exact_ranking():
+    rng = np.random.RandomState(0)
+    X = rng.rand(50, 8)
+    labels = ["t%d" % i for i in range(50)]
+    similarities = cosine_similarity(X)
+    np.fill_diagonal(similarities, -np.inf)
+
+    edges = top_k_cosine_edges(X, labels=labels, k=3, block_size=7, symmetric=False)
+
+    assert len(edges) == 50 * 3
+    assert edges["w"].is_monotonic_decreasing
+    for i in [0, 17, 49]:
+        expected = {"t%d" % j for j in np.argsort(-similarities[i])[:3]}
+        assert set(edges[edges["a"] == "t%d" % i]["b"]) == expected
+
+
+def test_top_k_cosine_edges_all_pairs_sparse_threshold():
+    rng = np.random.RandomState(1)
+    X = rng.rand(12, 5)
+    similarities = cosine_similarity(X)
+
+    edges = top_k_cosine_edges(
+        sparse.csr_matrix(X), k=None, threshold=0.8, block_size=5
+    )
+
+    expected = {
+        (i, j) for i in range(12) for j in range(i + 1, 12) if similarities[i, j] >= 0.8
+    }
+    assert set(zip(edges["a"], edges["b"])) == expected
+    assert np.allclose(
+        edges["w"], [similarities[a, b] for a, b in zip(edges["a"], edges["b"])]
+    )
+
+    with pytest.raises(ValueError):
+        top_k_cosine_edges(X, k=0)
+
+
+def test_cosine_index_exact_when_probing_all_lists(tmp_path):
+    rng = np.random.RandomState(2)
+    X = rng.randn(300, 16)
+    labels = ["t%d" % i for i in range(300)]
+    query = rng.randn(16)
+    exact = np.argsort(-cosine_similarity(X, query.reshape(1, -1)).ravel())[:5]
+
+    index = CosineIndex(n_lists=10, n_probe=2).build(X, labels=labels)
+    found, scores = index.query(query, k=5, n_probe=10)
+
+    assert list(found) == ["t%d" % i for i in exact]
+    assert np.all(np.diff(scores) <= 0)
+
+    index.save(str(tmp_path / "index"))
+    loaded = CosineIndex.load(str(tmp_path / "index"))
+    assert loaded.n_probe == 2
+    assert list(loaded.query(query, k=5, n_probe=10)[0]) == list(found)
+    assert len(loaded.query(query, k=5)[0]) <= 5
+
+    # integer labels are saved as such, replacing the previous text labels
+    index.build(X, labels=np.arange(300) * 2)
+    index.save(str(tmp_path / "index"))
+    loaded = CosineIndex.load(str(tmp_path / "index"))
+    assert loaded.labels.dtype.kind == "i"
+    assert list(loaded.query(query, k=5, n_probe=10)[0]) == [2 * i for i in exact]
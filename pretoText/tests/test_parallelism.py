@@ -0,0 +1,77 @@
+from pretoText.utils import parallelism
+from pretoText.utils.parallelism import HARD, HARD_SMART, SOFT, iter_job, perform_job
+import numpy as np
+import os
+import pickle
+import pytest
+
+
+def _square(x, offset=0):
+    return x * x + offset
+
+
+@pytest.mark.parametrize("level", [SOFT, HARD, HARD_SMART])
+def test_perform_job_in_order(level):
+    items = list(range(100))
+
+    assert perform_job(items, _square, level, 2, False, 1) == [x * x + 1 for x in items]
+    assert list(iter_job(iter(items), _square, level, 2, chunksize=7)) == [
+        x * x for x in items
+    ]
+
+
+_LOADS = []
+
+
+def _load_vectors(shared):
+    _LOADS.append(os.getpid())
+    return {"vectors": shared.array}
+
+
+def _row_sum(row):
+    return _LOADS.count(os.getpid()), float(
+        parallelism.get_resource("vectors")[row].sum()
+    )
+
+
+@pytest.mark.parametrize("level", [SOFT, HARD, HARD_SMART])
+def test_workers_share_an_array(level):
+    vectors = np.arange(4000, dtype=np.float32).reshape(400, 10)
+
+    with parallelism.share_array(vectors) as shared:
+        assert len(pickle.dumps(shared)) < 1000
+
+        pool = parallelism.hire(level, 2, initializer=_load_vectors, initargs=(shared,))
+        outputs = pool.perform_job(range(400), _row_sum, chunksize=10)
+
+    assert [total for _, total in outputs] == vectors.sum(axis=1).tolist()
+    # the initializer ran once in each worker process, before its first chunk
+    assert {loads for loads, _ in outputs} == {1}
+
+
+def test_iter_job_unordered():
+    outputs = iter_job(range(50), _square, HARD_SMART, 2, ordered=False, chunksize=5)
+
+    assert sorted(outputs) == [x * x for x in range(50)]
+
+
+def test_iter_job_without_joblib_generators(monkeypatch):
+    class ListsOnly(parallelism.Parallel):
+        def __init__(self, return_as="list", **kwargs):
+            if return_as != "list":
+                raise TypeError("unexpected keyword argument 'return_as'")
+            super(ListsOnly, self).__init__(**kwargs)
+
+    monkeypatch.setattr(parallelism, "Parallel", ListsOnly)
+    outputs = iter_job(range(50), _square, HARD_SMART, 2, ordered=False, chunksize=5)
+
+    assert list(outputs) == [x * x for x in range(50)]
+
+
+def test_auto_chunksize_from_task_duration(monkeypatch):
+    monkeypatch.setattr(parallelism, "CHUNK_DURATION", 0.01)
+
+    chunksize, outputs = parallelism._probe(iter(range(10)), lambda x: x, (), {})
+
+    assert outputs == list(range(10))
+    assert 1 <= chunksize <= parallelism.MAX_CHUNKSIZE
@@ -0,0 +1,246 @@
+from pretoText.scidata.Patent import (
+    Patent,
+    PatentCollection,
+    PatentReader,
+    PatentVectorizer,
+    read_patents,
+)
+import gzip
+import json
+import numpy as np
+import pytest
+
+
+RECORDS = [
+    {
+        "id": "US1",
+        "title": "Gear box",
+        "abstract": "A gear box.",
+        "claims": "1. A gear box.",
+        "description": "A long description.",
+        "cpc": ["F16H1/00", "F16H57/02"],
+    },
+    {
+        "id": "US2",
+        "title": "Brake",
+        "abstract": "A brake,\nwith a pad.",
+        "claims": "1. A brake.",
+        "description": "Another description.",
+        "cpc": ["B60T1/06"],
+    },
+    {
+        "id": "US3",
+        "title": "Wheel",
+        "abstract": "A wheel.",
+        "claims": "1. A wheel.",
+        "description": "A third description.",
+        "cpc": [],
+    },
+]
+
+
+def _write_jsonl(path):
+    with open(path, "w") as f:
+        for record in RECORDS:
+            f.write(json.dumps(record) + "\n")
+
+
+def _write_csv(path):
+    import csv
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "abstract", "claims", "description", "cpc"])
+        for r in RECORDS:
+            writer.writerow(
+                [r["id"], r["title"], r["abstract"], r["claims"], r["description"]]
+                + [";".join(r["cpc"])]
+            )
+
+
+def _write_xml(path):
+    with open(path, "w") as f:
+        f.write("<patents>")
+        for r in RECORDS:
+            f.write("<patent>")
+            for field in ("id", "title", "abstract", "claims", "description"):
+                f.write("<%s>%s</%s>" % (field, r[field], field))
+            for code in r["cpc"]:
+                f.write("<cpc>%s</cpc>" % code)
+            f.write("</patent>")
+        f.write("</patents>")
+
+
+def test_read_patents_all_formats(tmp_path):
+    expected = [Patent(**r) for r in RECORDS]
+
+    for name, writer in [
+        ("p.jsonl", _write_jsonl),
+        ("p.csv", _write_csv),
+        ("p.xml", _write_xml),
+    ]:
+        path = str(tmp_path / name)
+        writer(path)
+        assert list(read_patents(path)) == expected
+
+
+def test_read_patents_gzip_and_projection(tmp_path):
+    path = str(tmp_path / "p.jsonl.gz")
+    with gzip.open(path, "wt") as f:
+        for record in RECORDS:
+            f.write(json.dumps(record) + "\n")
+
+    patents = list(read_patents(path, fields=["id", "cpc"]))
+
+    assert [p.id for p in patents] == ["US1", "US2", "US3"]
+    assert patents[0].cpc == ["F16H1/00", "F16H57/02"]
+    assert all(p.abstract is None for p in patents)
+
+
+def test_read_patents_chunks(tmp_path):
+    path = str(tmp_path / "p.jsonl")
+    _write_jsonl(path)
+
+    chunks = list(read_patents(path, chunksize=2, fields=["id"]))
+
+    assert [[p.id for p in chunk] for chunk in chunks] == [["US1", "US2"], ["US3"]]
+
+
+def test_read_patents_csv_long_fields(tmp_path):
+    import csv
+
+    path = str(tmp_path / "p.csv")
+    description = "gear " * 40000
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "description"])
+        writer.writerow(["US1", description])
+
+    # the default limit, whatever an earlier read has set
+    csv.field_size_limit(131072)
+
+    assert [p.description for p in read_patents(path)] == [description]
+
+
+def test_patent_reader_resume(tmp_path):
+    for name, writer in [
+        ("p.jsonl", _write_jsonl),
+        ("p.csv", _write_csv),
+        ("p.xml", _write_xml),
+    ]:
+        path = str(tmp_path / name)
+        writer(path)
+
+        reader = PatentReader(path, fields=["id"])
+        chunks = reader.chunks(2)
+        assert [p.id for p in next(chunks)] == ["US1", "US2"]
+
+        resumed = PatentReader(path, fields=["id"], offset=reader.tell())
+        assert [p.id for p in resumed] == ["US3"]
+
+
+def test_patent_collection_access_and_views():
+    patents = [
+        Patent(**dict(r, date="2019-01-0%d" % (i + 1))) for i, r in enumerate(RECORDS)
+    ]
+    collection = PatentCollection.from_patents(patents)
+
+    assert len(collection) == 3
+    assert list(collection) == patents
+    assert collection[-1] == patents[-1]
+    assert collection.cpc_codes == ["F16H1/00", "F16H57/02", "B60T1/06"]
+    assert collection.dates.dtype == np.dtype("datetime64[D]")
+
+    view = collection[1:]
+    assert list(view) == patents[1:]
+    assert np.shares_memory(view.texts["abstract"][0], collection.texts["abstract"][0])
+    assert list(view.column("id")) == ["US2", "US3"]
+    assert list(view.to_dataframe()["title"]) == ["Brake", "Wheel"]
+
+
+def test_patent_collection_compressed():
+    patents = [Patent(**dict(r, id="US%d" % i)) for i in range(20) for r in RECORDS]
+    plain = PatentCollection.from_patents(patents)
+    # blocks so small that most texts span several of them
+    collection = PatentCollection.from_patents(patents, compress=True, block_size=8)
+
+    assert list(collection) == patents
+    assert collection[-1] == patents[-1]
+    assert list(collection[25:30].column("abstract")) == [
+        p.abstract or "" for p in patents[25:30]
+    ]
+    assert PatentCollection.from_patents(patents, compress=True).nbytes < plain.nbytes
+    assert list(PatentCollection.from_patents([], compress=True)) == []
+
+
+def test_patent_collection_projection():
+    collection = PatentCollection.from_patents(
+        [Patent(**r) for r in RECORDS], fields=["id", "cpc"]
+    )
+
+    assert collection.fields == ("id", "cpc")
+    assert collection[0].abstract is None
+    assert collection[2].cpc == []
+
+
+def test_patent_vectorizer_matches_count_vectorizer(tmp_path):
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    texts = [
+        "a gear box with a gear",
+        "a brake with a pad",
+        "a wheel and a gear",
+        "a brake and a wheel",
+    ]
+    expected = CountVectorizer(min_df=2, max_df=0.9)
+    X = expected.fit_transform(texts)
+
+    vectorizer = PatentVectorizer(min_df=2, max_df=0.9, chunksize=3)
+    vectorizer.fit(Patent(abstract=text) for text in texts)
+
+    assert vectorizer.vocabulary_ == expected.vocabulary_
+    assert (vectorizer.transform(texts) != X).nnz == 0
+
+    store = vectorizer.transform_to_disk(texts, str(tmp_path / "dtm"))
+    assert store.vocabulary == expected.get_feature_names_out().tolist()
+    assert (store.to_csr() != X).nnz == 0
+
+    store = vectorizer.transform_to_disk(texts[:1], str(tmp_path / "dtm"), append=True)
+    assert store.shape == (5, X.shape[1])
+
+    other = PatentVectorizer().fit(["wheel rim", "tire hub"])
+    with pytest.raises(ValueError):
+        other.transform_to_disk(texts, str(tmp_path / "dtm"), append=True)
+
+
+def test_patent_vectorizer_prunes_rare_terms():
+    vectorizer = PatentVectorizer(prune_at=2, chunksize=3)
+    vectorizer.fit(["common rare", "common other", "common other"])
+
+    assert sorted(vectorizer.vocabulary_) == ["common", "other"]
+
+    vectorizer = PatentVectorizer(prune_at=4).fit(["aa bb cc dd ee"])
+    assert len(vectorizer.document_frequencies) == 3
+
+
+def test_patent_vectorizer_max_features_by_term_count():
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    texts = ["aa aa aa aa aa bb", "bb cc", "cc dd", "dd ee", "ee bb"]
+    expected = CountVectorizer(max_features=1).fit(texts)
+
+    vectorizer = PatentVectorizer(max_features=1).fit(texts)
+
+    assert vectorizer.vocabulary_ == expected.vocabulary_ == {"aa": 0}
+
+
+def test_patent_vectorizer_hashing_parallel():
+    texts = ["a gear box with a gear", "a brake with a pad", "a wheel"] * 5
+
+    vectorizer = PatentVectorizer(
+        hashing=True, n_features=2**10, ngram_range=(1, 2), chunksize=4
+    ).fit(texts)
+    X = vectorizer.transform(texts)
+
+    assert X.shape == (15, 2**10)
+    assert (vectorizer.transform_parallel(texts, n_jobs=2) != X).nnz == 0
@@ -0,0 +1,67 @@
+from pretoText.scidata.vectors import (
+    cosine_similarity,
+    normalize_rows,
+    pairwise_cosine_similarity,
+)
+from scipy import sparse
+import math
+import numpy as np
+
+
+def _python_cosine_similarity(v1, v2):
+    sumxx, sumxy, sumyy = 0, 0, 0
+    for x, y in zip(v1, v2):
+        sumxx += x * x
+        sumyy += y * y
+        sumxy += x * y
+    if sumxx == 0.0 or sumyy == 0.0:
+        return 0.0
+    return sumxy / math.sqrt(sumxx * sumyy)
+
+
+def test_cosine_similarity_vectors():
+    assert math.isclose(
+        cosine_similarity([1, 2, 3], [4, 5, 6]),
+        _python_cosine_similarity([1, 2, 3], [4, 5, 6]),
+    )
+    assert cosine_similarity([0, 0], [1, 2]) == 0.0
+    assert isinstance(cosine_similarity([1, 0], [1, 0]), float)
+
+
+def test_cosine_similarity_one_and_many_to_many():
+    rng = np.random.RandomState(0)
+    X = rng.rand(4, 3)
+    X[2] = 0
+    Y = rng.rand(5, 3)
+    expected = np.array([[_python_cosine_similarity(x, y) for y in Y] for x in X])
+
+    assert np.allclose(cosine_similarity(X, Y), expected)
+    assert np.allclose(cosine_similarity(sparse.csr_matrix(X), Y), expected)
+    assert np.allclose(cosine_similarity(X[0], Y), expected[0])
+    assert np.allclose(cosine_similarity(X, Y[1]), expected[:, 1])
+
+    out = np.empty((4, 5), dtype=np.float32)
+    assert cosine_similarity(X, Y, dtype=np.float32, out=out) is out
+    assert np.allclose(out, expected, atol=1e-6)
+
+
+def test_pairwise_cosine_similarity():
+    rng = np.random.RandomState(1)
+    X = rng.rand(6, 4)
+    pairs = [(0, 1), (5, 2), (3, 3)]
+    expected = [_python_cosine_similarity(X[i], X[j]) for i, j in pairs]
+
+    assert np.allclose(pairwise_cosine_similarity(X, pairs, block_size=2), expected)
+    assert np.allclose(
+        pairwise_cosine_similarity(sparse.csr_matrix(X), pairs), expected
+    )
+
+
+def test_normalize_rows_keeps_zero_rows():
+    X = np.array([[3.0, 4.0], [0.0, 0.0]])
+
+    for normalized in [
+        normalize_rows(X),
+        normalize_rows(sparse.csr_matrix(X)).toarray(),
+    ]:
+        assert np.allclose(normalized, [[0.6, 0.8], [0.0, 0.0]])
@@ -0,0 +1,69 @@
+from pretoText.textanalysis.similarities import wordnet
+import pandas as pd
+import pytest
+import types
+
+
+class _Synset(str):
+    def name(self):
+        return str(self)
+
+
+LEXICON = {
+    "pump": ["pump.n.01", "pump.v.01", "heart.n.02"],
+    "heart": ["heart.n.01", "heart.n.02"],
+    "valve": ["valve.n.01", "valve.n.03"],
+    "rotor": ["rotor.n.01"],
+    "blade": ["blade.n.01", "rotor.n.01"],
+    "seal": ["seal.n.01", "valve.n.03"],
+}
+
+ITEMS = [
+    "pump valve",
+    "heart",
+    "rotor blade",
+    "blade blade seal",
+    "unknown word",
+    "pump",
+    "broken",
+]
+
+
+def _synsets(word):
+    if word == "broken":
+        raise ValueError(word)
+    return [_Synset(name) for name in LEXICON.get(word, [])]
+
+
+@pytest.fixture(autouse=True)
+def lexicon(monkeypatch):
+    # the WordNet corpus itself need not be installed
+    monkeypatch.setattr(wordnet, "wn", types.SimpleNamespace(synsets=_synsets))
+
+
+def test_incidence_product_matches_iteration_task():
+    incidence, synsets = wordnet.synset_incidence_matrix(ITEMS)
+    scores = incidence.dot(incidence.T).toarray()
+
+    assert sorted(synsets) == sorted({s for names in LEXICON.values() for s in names})
+    for a, item in enumerate(ITEMS):
+        row = wordnet._iteration_task(item, ITEMS)
+        for b, other in enumerate(ITEMS):
+            if other != item:
+                assert scores[a, b] == row.loc[item, other]
+
+
+def test_ranking_by_wordnet_from_df():
+    ranking = wordnet.ranking_by_wordnet_from_df(pd.DataFrame({"terms": ITEMS * 2}))
+
+    expected = {}
+    for item in ITEMS:
+        row = wordnet._iteration_task(item, ITEMS).iloc[0]
+        for other, w in row.items():
+            if w:
+                expected[frozenset([item, other])] = w
+
+    assert len(ranking) == len(expected)
+    assert list(ranking["w"]) == sorted(ranking["w"], reverse=True)
+    for a, b, w in ranking.itertuples(index=False):
+        assert expected[frozenset([a, b])] == w
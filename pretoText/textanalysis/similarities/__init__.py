@@ -0,0 +1,4 @@
+from pretoText._lazy import lazy_submodules
+
+
+__getattr__, __dir__ = lazy_submodules(__name__, ["wordnet"])
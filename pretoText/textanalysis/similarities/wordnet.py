@@ -0,0 +1,225 @@
+from collections import defaultdict
+from nltk.corpus import wordnet as wn
+from pretoText.scidata import graphs
+from pretoText.utils import importers
+from pretoText.utils import parallelism
+from scipy import sparse
+import numpy as np
+import pandas as pd
+import re
+
+
+__all__ = [
+    "ranking_by_wordnet_from_gsheet",
+    "ranking_by_wordnet_from_df",
+    "synset_incidence_matrix",
+]
+
+
+def ranking_by_wordnet_from_gsheet(
+    gsheet_id,
+    parallelisation=parallelism.SOFT,
+    column=None,
+    sheet_name=None,
+    limit=None,
+    save_csv=None,
+):
+    """
+    Perform a ranking by distance between each element in the given *gsheet*.
+    This distance is calculated by considering the number of common synonyms taken from *WordNet*.
+    If no ``column`` of the gsheet is specified, elements are taken from the first one.
+    If no ``sheet name`` inside the gsheet is specified, only the first one is considered.
+
+    Args:
+        gsheet_id (str):
+            The ID of the *gsheet*.
+        parallelisation (int, optional):
+            The level of parallelisation: 1 for *multithreading*, 2 for *multiprocessing*.
+            Defaults to parallelism.SOFT.
+        column (str, optional):
+            The column of the gsheet where to take elements from.
+            Defaults to None.
+        sheet_name (str, optional):
+            The name of the sheet where to take elements from.
+            Defaults to None.
+        limit (int, optional):
+            If specified, only first *limit* elements are ranked.
+            Defaults to None.
+        save_csv (str, optional):
+            If specified, the ranking is saved in that CSV file.
+            Defaults to None.
+
+    Returns:
+        :class:`pandas.DataFrame`:
+            The first two columns specify the elements compared and the third one has their similarity score.
+
+    """
+    return ranking_by_wordnet_from_df(
+        importers.get_df_from_gsheet(gsheet_id, sheet_name=sheet_name),
+        parallelisation=parallelisation,
+        column=column,
+        limit=limit,
+        save_csv=save_csv,
+    )
+
+
+def ranking_by_wordnet_from_df(
+    df, parallelisation=parallelism.SOFT, column=None, limit=None, save_csv=None
+):
+    """
+    Perform a ranking by distance between each element in the given :class:`pandas.DataFrame`.
+    This distance is calculated by considering the number of common synonyms taken from *WordNet*.
+    If no ``column`` of the gsheet is specified, elements are taken from the first one.
+    If no ``sheet name`` inside the gsheet is specified, only the first one is considered.
+
+    The score of two elements is the sum, over each pair of their words, of the synsets the words
+    have in common. Each distinct word is looked up once, by :func:`synset_incidence_matrix`,
+    and all the scores come from one sparse product of the element-synset counts with themselves.
+    Each distinct element is ranked once, and pairs with no synset in common are left out.
+
+    Args:
+        df (pandas.DataFrame):
+            The :class:`pandas.DataFrame` which to perform ranking to.
+        parallelisation (int, optional):
+            The level of parallelisation of *WordNet* lookups: 1 for *multithreading*,
+            2 for *multiprocessing*.
+            Defaults to parallelism.SOFT.
+        column (str, optional):
+            The column of the :class:`pandas.DataFrame` where to take elements from.
+            Defaults to None.
+        limit (int, optional):
+            If specified, only first *limit* elements are ranked.
+            Defaults to None.
+        save_csv (str, optional):
+            If specified, the ranking is saved in that CSV file.
+            Defaults to None.
+
+    Returns:
+        :class:`pandas.DataFrame`:
+            The first two columns specify the elements compared and the third one has their similarity score.
+
+    """
+    if column is not None:
+        df = pd.DataFrame(df[column])
+
+    if limit is not None:
+        df = df.head(limit)
+
+    items = list(dict.fromkeys(r[1].lower() for r in df.itertuples()))
+
+    incidence, _ = synset_incidence_matrix(items, parallelisation=parallelisation)
+    scores = incidence.dot(incidence.T).tocsr()
+    # an element is not ranked against itself
+    scores = scores - sparse.diags(scores.diagonal(), dtype=scores.dtype)
+
+    df = graphs.convert_matrix_to_adjacency_df(scores, labels=items)
+
+    df.sort_values(by="w", ascending=False, inplace=True)
+
+    if save_csv:
+        df.to_csv(save_csv)
+
+    return df
+
+
+def synset_incidence_matrix(items, parallelisation=parallelism.SOFT):
+    """
+    Count the *WordNet* synsets of the words of each element, split on spaces.
+    Each distinct word is looked up once, so the product of the matrix with its transpose
+    gives, for every pair of elements, the synsets their words have in common.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        incidence, synsets = synset_incidence_matrix(["centrifugal pump", "rotor"])
+        common = incidence.dot(incidence.T)
+
+    Args:
+        items (list):
+            The elements, as strings.
+        parallelisation (int, optional):
+            The level of parallelisation of lookups: 1 for *multithreading*, 2 for *multiprocessing*.
+            Defaults to parallelism.SOFT.
+
+    Returns:
+        tuple:
+            A ``scipy.sparse.csr_matrix`` of elements by synsets, counting the words of an element
+            having each synset, and the names of the synsets of its columns.
+    """
+    words = {}
+    rows, columns = [], []
+    for row, item in enumerate(items):
+        for word in re.split(r" ", item.lower()):
+            rows.append(row)
+            columns.append(words.setdefault(word, len(words)))
+
+    # repeated words of an element are summed up
+    counts = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, columns)),
+        shape=(len(items), len(words)),
+    )
+
+    pool = parallelism.hire(
+        parallelisation,
+        # force wordnet to be loaded once by each worker process
+        initializer=None if parallelisation == parallelism.SOFT else _load_wordnet,
+    )
+    word_synsets = pool.perform_job(list(words), _synset_names)
+
+    synsets = {}
+    indices = [
+        synsets.setdefault(name, len(synsets))
+        for names in word_synsets
+        for name in names
+    ]
+    indptr = np.cumsum([0] + [len(names) for names in word_synsets])
+    lexicon = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int64), indices, indptr),
+        shape=(len(words), len(synsets)),
+    )
+
+    return counts.dot(lexicon).tocsr(), list(synsets)
+
+
+def _load_wordnet():
+    wn.ensure_loaded()
+    return {}
+
+
+def _synset_names(word):
+    try:
+        return sorted({synset.name() for synset in wn.synsets(word)})
+    except:
+        return []
+
+
+def _iteration_task(item, items):
+
+    a_syns = []
+
+    for word in re.split(r" ", item.lower()):
+        try:
+            syns = wn.synsets(word)
+        except:
+            continue
+
+        a_syns.append(set(syns))
+
+    row = defaultdict(int)
+    for b in items:
+
+        if b == item:
+            continue
+
+        row[b] = 0
+
+        for syns in a_syns:
+            for word in re.split(r" ", b.lower()):
+                try:
+                    b_syns = wn.synsets(word)
+                except:
+                    continue
+
+                row[b] += len(syns.intersection(set(b_syns)))
+
+    return pd.DataFrame(row, index=[item])
@@ -0,0 +1,207 @@
+import numpy as np
+import os
+
+
+__all__ = ["ParquetEdgeWriter", "save_edges", "save_dtm_parquet"]
+
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+class ParquetEdgeWriter:
+    """
+    Stream an edge list, such as a similarity ranking, into a *Parquet* file.
+    Each written :class:`pandas.DataFrame` is flushed as its own row group, so edges
+    can be written as they are produced, without holding all of them in memory.
+
+    Text columns ``a`` and ``b`` are dictionary-encoded and weights ``w`` are stored as ``float32``.
+    Empty blocks are skipped, so they do not fix the type of columns, and an empty edge list
+    is written with text columns. Requires *pyarrow*.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        with ParquetEdgeWriter("ranking.parquet") as writer:
+            for edges in edge_blocks:
+                writer.write(edges)
+
+    Args:
+        path (str):
+            The path of the *Parquet* file.
+        compression (str, optional):
+            The compression codec.
+            Defaults to ``snappy``.
+    """
+
+    def __init__(self, path, compression="snappy"):
+        self.path = path
+        self.compression = compression
+        self._writer = None
+
+    def write(self, edges):
+        """
+        Write a block of edges as a row group.
+
+        Args:
+            edges (:class:`pandas.DataFrame`):
+                The edges, with columns ``a``, ``b`` and ``w``.
+        """
+        if not len(edges):
+            return
+
+        pa, pq = _require_pyarrow()
+
+        table = pa.table(
+            {
+                "a": _node_array(pa, edges["a"]),
+                "b": _node_array(pa, edges["b"]),
+                "w": pa.array(np.asarray(edges["w"], dtype=np.float32)),
+            }
+        )
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(
+                self.path, table.schema, compression=self.compression
+            )
+
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self):
+        """
+        Close the file. An empty file is still written if no edge was given.
+        """
+        if self._writer is None:
+            pa, pq = _require_pyarrow()
+
+            node = pa.dictionary(pa.int32(), pa.string())
+            schema = pa.schema([("a", node), ("b", node), ("w", pa.float32())])
+            self._writer = pq.ParquetWriter(
+                self.path, schema, compression=self.compression
+            )
+
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def save_edges(edges, path):
+    """
+    Save an edge list, such as a similarity ranking, in the format picked by the extension of ``path``:
+    *Parquet* for ``.parquet`` and ``.pq``, *CSV* for ``.csv``.
+
+    Args:
+        edges (:class:`pandas.DataFrame` or iterable):
+            The edges, with columns ``a``, ``b`` and ``w``,
+            or an iterable of such dataframes to be written one after the other.
+        path (str):
+            The path of the file.
+    """
+    import pandas as pd
+
+    blocks = [edges] if isinstance(edges, pd.DataFrame) else edges
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in PARQUET_EXTENSIONS:
+        with ParquetEdgeWriter(path) as writer:
+            for block in blocks:
+                writer.write(block)
+
+    elif extension == ".csv":
+        header = True
+        for block in blocks:
+            block.to_csv(path, mode="w" if header else "a", header=header)
+            header = False
+
+    else:
+        raise ValueError("Unsupported file extension: %s" % extension)
+
+
+def save_dtm_parquet(matrix, path, vocabulary=None, block_size=100000):
+    """
+    Save a document-term matrix into a *Parquet* file in long format, one row per nonzero entry:
+    the document (row) number, the term and its count.
+    Rows of the matrix are written by blocks of ``block_size``, each one as its own row group.
+    Terms are dictionary-encoded, if a vocabulary is given, with the dictionary of each row group
+    holding only the terms of its block. Requires *pyarrow*.
+
+    Args:
+        matrix (scipy.sparse.spmatrix or :class:`pretoText.scidata.matrices.CSRStore`):
+            The document-term matrix.
+        path (str):
+            The path of the *Parquet* file.
+        vocabulary (list or dict, optional):
+            The terms of the columns, in order, or terms key-valued to their column.
+            Defaults to None (the vocabulary of the store, if any, else column numbers).
+        block_size (int, optional):
+            The number of matrix rows written at once.
+            Defaults to 100000.
+    """
+    pa, pq = _require_pyarrow()
+
+    if hasattr(matrix, "tocsr"):
+        matrix = matrix.tocsr()
+    if vocabulary is None:
+        vocabulary = getattr(matrix, "vocabulary", None)
+    if isinstance(vocabulary, dict):
+        vocabulary = sorted(vocabulary, key=vocabulary.get)
+    if vocabulary is not None:
+        vocabulary = pa.array(vocabulary, type=pa.string())
+
+    with_terms = vocabulary is not None
+    schema = pa.schema(
+        [
+            ("document", pa.int64()),
+            (
+                "term",
+                pa.dictionary(pa.int32(), pa.string()) if with_terms else pa.int32(),
+            ),
+            ("count", pa.from_numpy_dtype(matrix.data.dtype)),
+        ]
+    )
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, matrix.shape[0], block_size):
+            block = matrix[start : start + block_size].tocsr()
+            block.sort_indices()
+
+            documents = start + np.repeat(
+                np.arange(block.shape[0], dtype=np.int64), np.diff(block.indptr)
+            )
+            if with_terms:
+                # the whole vocabulary would otherwise be written along with every row group
+                used, codes = np.unique(block.indices, return_inverse=True)
+                terms = pa.DictionaryArray.from_arrays(
+                    pa.array(codes.astype(np.int32)), vocabulary.take(pa.array(used))
+                )
+            else:
+                terms = pa.array(block.indices.astype(np.int32))
+
+            writer.write_table(
+                pa.table(
+                    [pa.array(documents), terms, pa.array(np.asarray(block.data))],
+                    schema=schema,
+                )
+            )
+
+
+def _node_array(pa, values):
+    values = np.asarray(values)
+    if values.dtype.kind in "OUS":
+        return pa.array(values.astype(str), type=pa.string()).dictionary_encode()
+    return pa.array(values)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required to export Parquet files: pip install pyarrow"
+        )
+
+    return pyarrow, pyarrow.parquet
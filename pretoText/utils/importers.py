@@ -0,0 +1,323 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urljoin, urlsplit
+import asyncio
+import hashlib
+import http.client
+import io
+import json
+import os
+import pandas as pd
+import threading
+
+
+__all__ = ["get_df_from_gsheet", "get_dfs_from_gsheets", "fetch_all", "HTTPSession"]
+
+
+GSHEET_EXPORT_URL = "https://docs.google.com/spreadsheets/d/%s/gviz/tq?tqx=out:csv"
+
+# statuses worth retrying: too many requests, and transient server errors
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+REDIRECT_STATUSES = frozenset([301, 302, 303, 307, 308])
+MAX_REDIRECTS = 5
+
+
+def get_df_from_gsheet(gsheet_id, sheet_name=None):
+    """
+    Import a *gsheet* by ID as a *dataframe*.
+
+    Args:
+        gsheet_id (str): The ID of the *gsheet*.
+        sheet_name (str, optional): name of the *sheet* where to take elements from. Defaults to None.
+
+    Returns:
+        pandas.DataFrame: a *dataframe* containing all imported data from the *gsheet*.
+    """
+    return pd.read_csv(_gsheet_url(gsheet_id, sheet_name))
+
+
+def get_dfs_from_gsheets(
+    sheets, cache_dir=None, max_connections=8, retries=3, backoff=0.5, timeout=30
+):
+    """
+    Import many *gsheets* as *dataframes*, fetching them concurrently with :func:`fetch_all`.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        terms, stopwords = get_dfs_from_gsheets(
+            [gsheet_id, (gsheet_id, "stopwords")], cache_dir="gsheets"
+        )
+
+    Args:
+        sheets (list):
+            The IDs of the *gsheets*, or pairs of an ID and the name of a *sheet*.
+        cache_dir (str, optional):
+            The folder where responses are cached, so that unchanged *gsheets* are not downloaded again.
+            Defaults to None (no cache).
+        max_connections (int, optional):
+            The number of requests in flight at once.
+            Defaults to 8.
+        retries (int, optional):
+            The number of times a failed request is retried.
+            Defaults to 3.
+        backoff (float, optional):
+            The seconds waited before the first retry, doubled at each retry.
+            Defaults to 0.5.
+        timeout (float, optional):
+            The seconds allowed to each connection and read.
+            Defaults to 30.
+
+    Returns:
+        list: a *dataframe* for each *gsheet*, in order.
+    """
+    urls = [
+        _gsheet_url(*sheet) if isinstance(sheet, tuple) else _gsheet_url(sheet)
+        for sheet in sheets
+    ]
+    bodies = asyncio.run(
+        fetch_all(
+            urls,
+            cache_dir=cache_dir,
+            max_connections=max_connections,
+            retries=retries,
+            backoff=backoff,
+            timeout=timeout,
+        )
+    )
+    return [pd.read_csv(io.BytesIO(body)) for body in bodies]
+
+
+async def fetch_all(
+    urls, cache_dir=None, max_connections=8, retries=3, backoff=0.5, timeout=30
+):
+    """
+    Fetch the bodies of many URLs concurrently, over the pooled connections of a :class:`HTTPSession`.
+
+    Requests failing on a network error, or answered by a status of ``RETRY_STATUSES``, are retried
+    after an exponential backoff, or the delay asked by a ``Retry-After`` header.
+    With a ``cache_dir``, bodies are kept on disk with their ``ETag`` and ``Last-Modified`` headers,
+    and later requests of the same URL are conditional: a ``304 Not Modified`` response
+    is served from the cache.
+
+    Args:
+        urls (list):
+            The URLs to fetch.
+        cache_dir (str, optional):
+            The folder where responses are cached.
+            Defaults to None (no cache).
+        max_connections (int, optional):
+            The number of requests in flight at once.
+            Defaults to 8.
+        retries (int, optional):
+            The number of times a failed request is retried.
+            Defaults to 3.
+        backoff (float, optional):
+            The seconds waited before the first retry, doubled at each retry.
+            Defaults to 0.5.
+        timeout (float, optional):
+            The seconds allowed to each connection and read.
+            Defaults to 30.
+
+    Raises:
+        ConnectionError: if a URL cannot be fetched, once retries are exhausted.
+
+    Returns:
+        list: the body of each URL, as bytes, in order.
+    """
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    loop = asyncio.get_running_loop()
+    with HTTPSession(timeout=timeout) as session, ThreadPoolExecutor(
+        max_connections
+    ) as executor:
+        # the executor bounds the requests in flight, while retries wait in the event loop
+        def get(url, headers):
+            return loop.run_in_executor(executor, session.get, url, headers)
+
+        return await asyncio.gather(
+            *(_fetch(get, url, cache_dir, retries, backoff) for url in urls)
+        )
+
+
+class HTTPSession:
+    """
+    A pool of keep-alive HTTP connections, shared by threads, so that requests to the same host
+    reuse open connections rather than opening one each. Redirects are followed.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        with HTTPSession() as session:
+            status, headers, body = session.get(url)
+
+    Args:
+        timeout (float, optional):
+            The seconds allowed to each connection and read.
+            Defaults to 30.
+    """
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None):
+        """
+        Send a ``GET`` request.
+
+        Args:
+            url (str):
+                The URL, ``http`` or ``https``.
+            headers (dict, optional):
+                The headers of the request.
+                Defaults to None.
+
+        Returns:
+            tuple: the status, the headers (:class:`http.client.HTTPMessage`) and the body of the response.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = self._request(url, headers or {})
+            location = response_headers.get("Location")
+            if status not in REDIRECT_STATUSES or location is None:
+                return status, response_headers, body
+            url = urljoin(url, location)
+
+        raise ConnectionError("Too many redirects from %s" % url)
+
+    def close(self):
+        """Close all the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _request(self, url, headers):
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.netloc)
+        target = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+
+        with self._lock:
+            idle = self._idle.get(origin)
+            connection = idle.pop() if idle else None
+
+        if connection is not None:
+            try:
+                response = _send(connection, target, headers)
+            except ConnectionError:
+                # the server may have closed the connection while it was idle
+                connection = None
+
+        if connection is None:
+            connection = self._connect(origin)
+            response = _send(connection, target, headers)
+
+        if response.will_close:
+            connection.close()
+        else:
+            with self._lock:
+                self._idle.setdefault(origin, []).append(connection)
+
+        return response.status, response.headers, response.body
+
+    def _connect(self, origin):
+        scheme, netloc = origin
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        if scheme == "http":
+            return http.client.HTTPConnection(netloc, timeout=self.timeout)
+        raise ValueError("Unsupported URL scheme: %r" % scheme)
+
+
+def _gsheet_url(gsheet_id, sheet_name=None):
+    export_url = GSHEET_EXPORT_URL % gsheet_id
+
+    if sheet_name is not None:
+        export_url += "&sheet=%s" % quote(sheet_name)
+
+    return export_url
+
+
+def _send(connection, target, headers):
+    try:
+        connection.request("GET", target, headers=headers)
+        response = connection.getresponse()
+        response.body = response.read()
+    except BaseException:
+        connection.close()
+        raise
+
+    return response
+
+
+async def _fetch(get, url, cache_dir, retries, backoff):
+    cache = None
+    if cache_dir is not None:
+        cache = os.path.join(cache_dir, hashlib.sha256(url.encode()).hexdigest())
+
+    headers = {}
+    meta = _read_meta(cache)
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    for attempt in range(retries + 1):
+        delay = backoff * 2**attempt
+        try:
+            status, response_headers, body = await get(url, headers)
+        except (OSError, http.client.HTTPException) as error:
+            failure = error
+        else:
+            if status == 304 and meta:
+                with open(cache, "rb") as f:
+                    return f.read()
+            if status == 200:
+                if cache is not None:
+                    _write_cache(cache, url, response_headers, body)
+                return body
+            failure = ConnectionError("HTTP %d when fetching %s" % (status, url))
+            if status not in RETRY_STATUSES:
+                raise failure
+            retry_after = response_headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = int(retry_after)
+
+        if attempt < retries:
+            await asyncio.sleep(delay)
+
+    raise ConnectionError("Failed to fetch %s" % url) from failure
+
+
+def _read_meta(cache):
+    # headers are written after their body, and removed before it is replaced
+    if cache is None or not os.path.exists(cache + ".json"):
+        return {}
+
+    with open(cache + ".json") as f:
+        return json.load(f)
+
+
+def _write_cache(cache, url, headers, body):
+    with open(cache + ".tmp", "wb") as f:
+        f.write(body)
+    if os.path.exists(cache + ".json"):
+        os.remove(cache + ".json")
+    os.replace(cache + ".tmp", cache)
+
+    meta = {
+        "url": url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }
+    with open(cache + ".json.tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(cache + ".json.tmp", cache + ".json")
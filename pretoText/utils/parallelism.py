@@ -0,0 +1,414 @@
+from joblib import cpu_count, delayed, Parallel
+from threading import RLock
+from tqdm import tqdm
+import numpy as np
+import time
+import uuid
+
+
+__all__ = [
+    "SOFT",
+    "HARD",
+    "HARD_SMART",
+    "WorkersPool",
+    "hire",
+    "perform_job",
+    "iter_job",
+    "get_resource",
+    "SharedArray",
+    "share_array",
+]
+
+
+SOFT = 1  # parallelism by multithreading
+HARD = 2  # parallelism by multiprocessing
+HARD_SMART = 3  # parallelism by loky
+
+# seconds of work in each chunk of items sent to a worker, when chunks are sized automatically
+CHUNK_DURATION = 0.2
+# seconds spent running the first items in the calling process to time the task
+PROBE_DURATION = 0.02
+MAX_CHUNKSIZE = 10000
+
+# resources loaded by worker initializers, and the pools already initialized, in this process
+_RESOURCES = {}
+_INITIALIZED = set()
+# shared memories mapped in this process, kept open as long as the process lives
+_ATTACHED = {}
+_LOCK = RLock()
+
+
+class WorkersPool(Parallel):
+    """
+    An optimized :class:`joblib.Parallel` class for performing parallelized tasks.
+    It is made easier to select the parallelisation level and the size of the pool.
+
+    An ``initializer`` loads the resources of tasks (models, lexicons, tables) once in each
+    worker process, rather than once per task: it is called with ``initargs`` before the first
+    chunk a process performs for the pool, and the dict it returns is merged into the resources
+    that tasks read with :func:`get_resource`. ``initargs`` are sent along with every chunk,
+    so large arrays among them should be given as :class:`SharedArray`.
+
+    """
+
+    def __init__(
+        self, level=SOFT, size=-1, verbose=False, initializer=None, initargs=()
+    ):
+        if level == SOFT:
+            backend = "threading"
+        elif level == HARD:
+            backend = "multiprocessing"
+        elif level == HARD_SMART:
+            backend = "loky"
+
+        self.level = level
+        self._setup = (
+            None if initializer is None else (uuid.uuid4().hex, initializer, initargs)
+        )
+        self._settings = dict(
+            n_jobs=size,
+            backend=backend,
+            require="sharedmem" if level == SOFT else None,
+            verbose=100 if verbose else 0,
+        )
+        super(WorkersPool, self).__init__(**self._settings)
+
+    def perform_job(self, items, task, *task_args, **task_kwargs):
+        """
+        Perform a task to each element of a set of items in parallel.
+        Items are sent to workers in chunks, as in :meth:`iter_job`.
+
+        Args:
+            items (list):
+                A set of elements which to perform a task to.
+            task (function):
+                A function which will be applied to each element.
+
+        Returns:
+            list:
+                Contains any returned output from each task performed.
+        """
+        return list(self.iter_job(items, task, *task_args, **task_kwargs))
+
+    def iter_job(
+        self, items, task, *task_args, chunksize="auto", ordered=True, **task_kwargs
+    ):
+        """
+        Perform a task to each element of a set of items in parallel, streaming back the outputs,
+        so that they need not be held all together.
+
+        Items are sent to workers in chunks, one call per chunk, so that dispatching and pickling
+        are paid once per chunk rather than once per item. With an ``auto`` chunk size,
+        the first items are run in the calling process to time the task, and chunks are sized
+        to take about ``CHUNK_DURATION`` seconds each.
+
+        Args:
+            items (iterable):
+                A set of elements which to perform a task to.
+            task (function):
+                A function which will be applied to each element.
+            chunksize (int or str, optional):
+                The number of items of each chunk, or ``auto``.
+                Defaults to ``auto``.
+            ordered (bool, optional):
+                Whether outputs come in the order of items, else as soon as their chunk is done.
+                The ``HARD`` level, as *joblib* older than 1.4, cannot stream outputs as completed:
+                they always come in order.
+                Defaults to True.
+
+        Returns:
+            generator:
+                The output of each task performed.
+        """
+        items = iter(tqdm(items))
+
+        if chunksize == "auto":
+            _initialize(self._setup)
+            chunksize, outputs = _probe(items, task, task_args, task_kwargs)
+            yield from outputs
+
+        jobs = (
+            delayed(_perform_chunk)(chunk, task, task_args, task_kwargs, self._setup)
+            for chunk in _chunked(items, chunksize)
+        )
+
+        try:
+            parallel = Parallel(
+                return_as="generator" if ordered else "generator_unordered",
+                **self._settings
+            )
+        except (TypeError, ValueError):
+            # the multiprocessing backend, as joblib before 1.3 (1.4 for unordered outputs),
+            # returns lists only: chunks are sent by windows
+            parallel = None
+
+        if parallel is not None:
+            for outputs in parallel(jobs):
+                yield from outputs
+            return
+
+        with Parallel(**self._settings) as parallel:
+            for window in _chunked(jobs, 4 * cpu_count()):
+                for outputs in parallel(window):
+                    yield from outputs
+
+
+def hire(level=SOFT, n_workers=-1, verbose=False, initializer=None, initargs=()):
+    """
+    Get a :class:`WorkersPool` with a number of ``n_workers`` ready for a job.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        def load_vectors(shared):
+            return {"vectors": shared.array}
+
+        def closest(term_id):
+            return get_resource("vectors")[term_id].argmax()
+
+        with share_array(vectors) as shared:
+            pool = hire(HARD_SMART, initializer=load_vectors, initargs=(shared,))
+            closest_terms = pool.perform_job(term_ids, closest)
+
+    Args:
+        level (int, optional):
+            The level of parallalisation: 1 for *multithreading*, 2 for *multiprocessing*.
+            Defaults to SOFT.
+        n_workers (int, optional):
+            The number of workers that will work simultaneously.
+            If ``level`` is ``SOFT``, the best value is the max number of threads supported by the CPU.
+            If ``level`` is ``HARD``, the best value is the number of cores the CPU has.
+            Defaults to -1 (automatically get *cores count* workers).
+        verbose (bool, optional):
+            Activate a verbosity. It gives progress visual feedbacks.
+            Defaults to False.
+        initializer (function, optional):
+            A function called once in each worker process, returning a dict of named resources.
+            Defaults to None.
+        initargs (tuple, optional):
+            The arguments of ``initializer``.
+            Defaults to ().
+
+    Returns:
+        WorkersPool: The :class:`WorkerPool` ready for a job.
+    """
+    return WorkersPool(
+        level=level,
+        size=n_workers,
+        verbose=verbose,
+        initializer=initializer,
+        initargs=initargs,
+    )
+
+
+def perform_job(
+    items, task, level=SOFT, n_workers=-1, verbose=False, *task_args, **task_kwargs
+):
+    """
+    Perform a task to each element of a set of items in parallel.
+
+    Args:
+        items (list):
+            A set of elements which to perform a task to.
+        task (function):
+            A function which will be applied to each element.
+        level (int, optional):
+            The level of parallalisation: 1 for *multithreading*, 2 for *multiprocessing*.
+            Defaults to SOFT.
+        n_workers (int, optional):
+            The number of workers that will work simultaneously.
+            If ``level`` is ``SOFT``, the best value is the max number of threads supported by the CPU.
+            If ``level`` is ``HARD``, the best value is the number of cores the CPU has.
+            Defaults to -1 (automatically get *cores count* workers).
+        verbose (bool, optional):
+            Activate a verbosity. It gives progress visual feedbacks.
+            Defaults to False.
+
+    Returns:
+        list:
+            Contains any returned output from each task performed.
+    """
+    pool = hire(level=level, n_workers=n_workers, verbose=verbose)
+    return pool.perform_job(items, task, *task_args, **task_kwargs)
+
+
+def iter_job(
+    items, task, level=SOFT, n_workers=-1, verbose=False, *task_args, **task_kwargs
+):
+    """
+    Perform a task to each element of a set of items in parallel, streaming back the outputs.
+    ``chunksize`` and ``ordered`` can be given as in :meth:`WorkersPool.iter_job`.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        for ranking in iter_job(terms, rank, level=HARD_SMART, ordered=False):
+            ranking.to_csv(path, mode="a", header=False)
+
+    Args:
+        items (iterable):
+            A set of elements which to perform a task to.
+        task (function):
+            A function which will be applied to each element.
+        level (int, optional):
+            The level of parallalisation: 1 for *multithreading*, 2 for *multiprocessing*.
+            Defaults to SOFT.
+        n_workers (int, optional):
+            The number of workers that will work simultaneously.
+            Defaults to -1 (automatically get *cores count* workers).
+        verbose (bool, optional):
+            Activate a verbosity. It gives progress visual feedbacks.
+            Defaults to False.
+
+    Returns:
+        generator:
+            The output of each task performed.
+    """
+    pool = hire(level=level, n_workers=n_workers, verbose=verbose)
+    return pool.iter_job(items, task, *task_args, **task_kwargs)
+
+
+def get_resource(name):
+    """
+    Get a resource loaded in this process by the initializer of a :class:`WorkersPool`.
+
+    Args:
+        name (str):
+            The key of the resource in the dict returned by the initializer.
+
+    Returns:
+        object: The resource.
+    """
+    try:
+        return _RESOURCES[name]
+    except KeyError:
+        raise KeyError(
+            "No resource named %r was loaded by a worker initializer" % name
+        ) from None
+
+
+class SharedArray:
+    """
+    A numpy array in shared memory, which workers of any level read without copies:
+    it is pickled as its name, shape and type only, and each worker process maps the memory
+    once, whatever the number of tasks it performs.
+
+    Arrays are created with :func:`share_array`, and freed by :meth:`close` (or leaving a
+    ``with`` block) in the process which shared them, once workers are done.
+    Workers must not write to :attr:`array`.
+
+    """
+
+    def __init__(self, name, shape, dtype, memory=None):
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._memory = memory
+
+    @property
+    def array(self):
+        """numpy.ndarray: A view of the shared memory."""
+        memory = self._memory if self._memory is not None else _attach(self.name)
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=memory.buf)
+
+    def close(self):
+        """Free the shared memory. No view of :attr:`array` may be held anymore."""
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def __getstate__(self):
+        return {"name": self.name, "shape": self.shape, "dtype": self.dtype}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def share_array(array):
+    """
+    Copy an array into shared memory, e.g. an embedding table read by all the workers of a
+    ``HARD`` pool.
+
+    Args:
+        array (numpy.ndarray):
+            The array to share.
+
+    Returns:
+        SharedArray: The shared copy of the array.
+    """
+    from multiprocessing import shared_memory
+
+    array = np.asarray(array)
+    memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = SharedArray(memory.name, array.shape, array.dtype, memory=memory)
+    shared.array[...] = array
+    return shared
+
+
+def _attach(name):
+    from multiprocessing import resource_tracker, shared_memory
+
+    with _LOCK:
+        if name not in _ATTACHED:
+            try:
+                memory = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # before python 3.13, attaching registers the memory for its removal
+                # when this process ends, while the sharing process owns it
+                register = resource_tracker.register
+                resource_tracker.register = lambda *args: None
+                try:
+                    memory = shared_memory.SharedMemory(name=name)
+                finally:
+                    resource_tracker.register = register
+            _ATTACHED[name] = memory
+
+        return _ATTACHED[name]
+
+
+def _initialize(setup):
+    if setup is None or setup[0] in _INITIALIZED:
+        return
+
+    token, initializer, initargs = setup
+    with _LOCK:
+        if token not in _INITIALIZED:
+            _RESOURCES.update(initializer(*initargs) or {})
+            _INITIALIZED.add(token)
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _perform_chunk(chunk, task, task_args, task_kwargs, setup=None):
+    _initialize(setup)
+    return [task(item, *task_args, **task_kwargs) for item in chunk]
+
+
+def _probe(items, task, task_args, task_kwargs):
+    outputs = []
+    start = time.perf_counter()
+    for item in items:
+        outputs.append(task(item, *task_args, **task_kwargs))
+        if time.perf_counter() - start >= PROBE_DURATION:
+            break
+
+    duration = (time.perf_counter() - start) / max(len(outputs), 1)
+    chunksize = int(CHUNK_DURATION / duration) if duration > 0 else MAX_CHUNKSIZE
+    return min(max(chunksize, 1), MAX_CHUNKSIZE), outputs
@@ -14,14 +14,14 @@ DESCRIPTION = "NLP toolkit for Technical Texts"
 URL = "https://github.com/nicolamelluso/pretoText"
 EMAIL = "nicolamelluso@gmail.com"
 AUTHOR = "Nicola Melluso"
-REQUIRES_PYTHON = ">=3.6.0"
+REQUIRES_PYTHON = ">=3.7.0"
 VERSION = versioneer.get_version()
 
 # What packages are required for this module to be executed?
 REQUIRED = open("requirements.txt", 'r').read().splitlines()
 
 # What packages are optional?
-EXTRAS = {}
+EXTRAS = {"parquet": ["pyarrow"]}
 
 # The rest you shouldn't have to touch too much :)
 # ------------------------------------------------
@@ -65,7 +65,6 @@ setup(
         # Full list: https://pypi.python.org/pypi?%3Aaction=list_classifiers
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: Implementation :: CPython",
         "Programming Language :: Python :: Implementation :: PyPy",